@@ -1 +1 @@
-from .summarize_agent import summary_agent as summary_agent
\ No newline at end of file
+from .summarize_agent import summary_agent as summary_agent, chunk_summary_agent as chunk_summary_agent
\ No newline at end of file
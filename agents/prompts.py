@@ -0,0 +1,18 @@
+import hashlib
+
+import yaml
+
+
+def load_prompts():
+    """Load all prompts from prompts.yaml file"""
+    with open("agents/prompts.yaml", "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def prompt_version(model: str, *prompts: str) -> str:
+    """Short hash of a model and its prompts.
+
+    Part of the summary and translation cache keys, so cached results go
+    stale whenever a prompt or the model changes.
+    """
+    return hashlib.sha256("\n".join((model, *prompts)).encode()).hexdigest()[:12]
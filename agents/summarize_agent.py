@@ -1,24 +1,29 @@
 from dotenv import load_dotenv
-import yaml
 
 from langchain.agents import create_agent
 
-load_dotenv()
+from .prompts import load_prompts, prompt_version
 
-def load_prompts():
-    """Load all prompts from prompts.yaml file"""
-    with open("agents/prompts.yaml", "r", encoding="utf-8") as f:
-        prompts = yaml.safe_load(f)
-    return prompts
+load_dotenv()
 
 prompts = load_prompts()
 summary_prompt = prompts["SUMMARIZE_PROMPT"]
+chunk_summary_prompt = prompts["CHUNK_SUMMARIZE_PROMPT"]
+
+SUMMARY_MODEL = "openai:gpt-5-mini"
+SUMMARY_PROMPT_VERSION = prompt_version(SUMMARY_MODEL, summary_prompt, chunk_summary_prompt)
 
 summary_agent = create_agent(
-    model="openai:gpt-5-mini",
+    model=SUMMARY_MODEL,
     system_prompt=summary_prompt
 )
 
+# Map step of long-transcript summarization: notes for one section at a time.
+chunk_summary_agent = create_agent(
+    model=SUMMARY_MODEL,
+    system_prompt=chunk_summary_prompt
+)
+
 
 
 # to test  python -m agents.summarize_agent
@@ -1,22 +1,22 @@
 from dotenv import load_dotenv
 from cerebras.cloud.sdk import AsyncCerebras
 import os
-import yaml
 
-load_dotenv()
+from .prompts import load_prompts, prompt_version
 
-def load_prompts():
-    with open("agents/prompts.yaml", "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+load_dotenv()
 
 prompts = load_prompts()
 translate_prompt = prompts["TRANSLATE_PROMPT"]
 
+TRANSLATE_MODEL = "gpt-oss-120b"
+TRANSLATE_PROMPT_VERSION = prompt_version(TRANSLATE_MODEL, translate_prompt)
+
 client = AsyncCerebras(api_key=os.environ.get("CEREBRAS_API_KEY"))
 
 async def translate(text: str, language: str) -> str:
     response = await client.chat.completions.create(
-        model="gpt-oss-120b",
+        model=TRANSLATE_MODEL,
         messages=[
             {"role": "system", "content": translate_prompt},
             {"role": "user", "content": f"Translate the following to {language}:\n\n{text}"},
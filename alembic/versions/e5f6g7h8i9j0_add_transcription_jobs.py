@@ -0,0 +1,46 @@
+"""add transcription_jobs table
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6g7h8i9j0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6g7h8i9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create transcription_jobs table for queued premium transcriptions."""
+    op.create_table(
+        'transcription_jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('video_id', sa.String(20), nullable=False),
+        sa.Column('video_url', sa.String(2048), nullable=False),
+        sa.Column('language', sa.String(20), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('stage', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index('ix_transcription_jobs_user_id', 'transcription_jobs', ['user_id'])
+    op.create_index('ix_transcription_jobs_status', 'transcription_jobs', ['status'])
+
+
+def downgrade() -> None:
+    """Drop transcription_jobs table."""
+    op.drop_index('ix_transcription_jobs_status', table_name='transcription_jobs')
+    op.drop_index('ix_transcription_jobs_user_id', table_name='transcription_jobs')
+    op.drop_table('transcription_jobs')
@@ -0,0 +1,40 @@
+"""add audio_transcripts table
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6g7h8i9j0k1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6g7h8i9j0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create audio_transcripts table storing raw Deepgram utterances per video."""
+    op.create_table(
+        'audio_transcripts',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('video_id', sa.String(20), nullable=False),
+        sa.Column('model', sa.String(50), nullable=False),
+        sa.Column('language', sa.String(20), nullable=False),
+        sa.Column('utterances', sa.LargeBinary(), nullable=False),
+        sa.Column('word_count', sa.Integer(), nullable=False),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.UniqueConstraint('video_id', 'model', 'language', name='uq_audio_transcript'),
+    )
+
+
+def downgrade() -> None:
+    """Drop audio_transcripts table."""
+    op.drop_table('audio_transcripts')
@@ -1,4 +1,8 @@
+import time
+import threading
+
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 import os
 from dotenv import load_dotenv
@@ -8,9 +12,81 @@ database_url = os.getenv("DATABASE_URL")
 if database_url and database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(database_url)
+# Per worker process: (DB_POOL_SIZE + DB_MAX_OVERFLOW) x workers must stay under
+# the Postgres connection limit.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Recycle before the platform proxy's idle timeout drops the connection under us.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 30 * 60))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# asyncpg's prepared statement cache; set to 0 behind a transaction-mode pgbouncer.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+
+
+class _PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.failures = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, failed: bool = False):
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+_pool_stats = _PoolStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited (including pre-ping)."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            _pool_stats.record(time.perf_counter() - started, failed=True)
+            raise
+        _pool_stats.record(time.perf_counter() - started)
+        return connection
+
+
+engine = create_async_engine(
+    database_url,
+    poolclass=TimedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={"statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+)
 SessionLocal = async_sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 async def get_db():
     async with SessionLocal() as db:
         yield db
+
+
+def pool_stats() -> dict:
+    pool = engine.pool
+    checkouts = _pool_stats.checkouts
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checkouts": checkouts,
+        "failed_checkouts": _pool_stats.failures,
+        "wait_seconds_avg": round(_pool_stats.wait_seconds_total / checkouts, 4) if checkouts else None,
+        "wait_seconds_max": round(_pool_stats.wait_seconds_max, 4),
+    }
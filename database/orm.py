@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, Integer, Text, JSON, Index, Float, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
@@ -52,3 +52,40 @@ class Subscription(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     user = relationship("User", backref="subscription")
+
+
+class TranscriptionJob(Base):
+    __tablename__ = "transcription_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    video_id = Column(String(20), nullable=False)
+    video_url = Column(String(2048), nullable=False)
+    language = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")   # queued | running | done | failed
+    stage = Column(String(20), nullable=False, default="queued")    # queued | resolving | transcribing | done | failed
+    error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)                            # {"segments": [...], "word_count": n}
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_transcription_jobs_status", "status"),
+    )
+
+
+class AudioTranscript(Base):
+    __tablename__ = "audio_transcripts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    video_id = Column(String(20), nullable=False)
+    model = Column(String(50), nullable=False)
+    language = Column(String(20), nullable=False)
+    utterances = Column(LargeBinary, nullable=False)   # zlib-compressed JSON of parallel start/end/text arrays
+    word_count = Column(Integer, nullable=False)
+    duration = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("video_id", "model", "language", name="uq_audio_transcript"),
+    )
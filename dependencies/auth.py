@@ -4,6 +4,7 @@ from sqlalchemy import select
 from jose import jwt, JWTError  
 from database.connection import get_db
 from database.orm import User
+from services.user_cache import get_cached_user, cache_user
 import os
 from dotenv import load_dotenv
 
@@ -30,8 +31,13 @@ async def get_current_user(
     if not user_id:
         return None
 
+    cached = get_cached_user(user_id)
+    if cached:
+        return cached
+
     result = await db.execute(select(User).where(User.id == user_id))
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    return cache_user(user) if user else None
 
 
 async def require_premium(user=Depends(get_current_user)):
@@ -125,7 +125,7 @@ export default function Home() {
     setShowSignIn(false);
     try {
       const transcription = result.segments.map((s) => s.text).join(" ");
-      const summaryData = await fetchSummary(transcription);
+      const summaryData = await fetchSummary(transcription, result.transcript_id);
       setSummary(summaryData.summary);
     } catch (err) {
       handleApiError(err);
@@ -142,9 +142,11 @@ export default function Home() {
     setError(null);
     setShowSignIn(false);
     try {
-      await fetchTranslationStream(result.segments, language, (chunk) => {
-        setTranslation((prev) => (prev || "") + chunk + "\n\n");
-      });
+      await fetchTranslationStream(result.segments, language, (chunk, untranslated) => {
+        // Failed segments come back in the source language; say so instead of passing them off as translated.
+        const text = untranslated ? `[Not translated] ${chunk}` : chunk;
+        setTranslation((prev) => (prev || "") + text + "\n\n");
+      }, result.transcript_id);
     } catch (err) {
       handleApiError(err);
     } finally {
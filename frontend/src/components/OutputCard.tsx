@@ -114,7 +114,7 @@ export default function OutputCard({ result, mode, loading, summary, translation
   });
 
   async function handleDownload() {
-    await downloadPdf(result.segments, result.video_id);
+    await downloadPdf(result.segments, result.video_id, result.transcript_id);
   }
 
   return (
@@ -2,6 +2,28 @@ import { TranscriptResponse, SummaryResponse, TranslateResponse, Segment, Transl
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
+// Send the server-side transcript handle instead of the whole transcript; fall
+// back to uploading it when the handle is missing or the server no longer has it.
+async function postTranscript(
+  path: string,
+  body: object,
+  transcriptId: string | undefined,
+  fallback: object,
+): Promise<Response> {
+  const post = (payload: object) =>
+    fetch(`${API_URL}${path}`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(payload),
+      credentials: "include",
+    });
+  if (transcriptId) {
+    const res = await post({ ...body, transcript_id: transcriptId });
+    if (res.status !== 400 && res.status !== 404) return res;
+  }
+  return post({ ...body, ...fallback });
+}
+
 export interface CurrentUser {
   name: string;
   email: string;
@@ -71,13 +93,8 @@ export async function fetchTranscriptPremium(
   return res.json();
 }
 
-export async function fetchSummary(transcription: string): Promise<SummaryResponse> {
-  const res = await fetch(`${API_URL}/video/summary`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ transcription }),
-    credentials: "include",
-  });
+export async function fetchSummary(transcription: string, transcriptId?: string): Promise<SummaryResponse> {
+  const res = await postTranscript("/video/summary", {}, transcriptId, { transcription });
   if (!res.ok) {
     if (res.status === 401) throw new Error("__AUTH__Sign in required");
     if (res.status === 403) throw new Error("__PREMIUM__Premium subscription required");
@@ -90,14 +107,10 @@ export async function fetchSummary(transcription: string): Promise<SummaryRespon
 export async function fetchTranslationStream(
   segments: Segment[],
   language: string,
-  onChunk: (text: string) => void,
+  onChunk: (text: string, untranslated: boolean) => void,
+  transcriptId?: string,
 ): Promise<void> {
-  const res = await fetch(`${API_URL}/video/translate`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ segments, language }),
-    credentials: "include",
-  });
+  const res = await postTranscript("/video/translate", { language }, transcriptId, { segments });
   if (!res.ok) {
     if (res.status === 401) throw new Error("__AUTH__Sign in required");
     if (res.status === 403) throw new Error("__PREMIUM__Premium subscription required");
@@ -120,7 +133,7 @@ export async function fetchTranslationStream(
       const event: TranslateChunkEvent = JSON.parse(line.slice(6));
       if (event.error) throw new Error(event.error);
       if (event.done) return;
-      if (event.translation) onChunk(event.translation);
+      if (event.translation) onChunk(event.translation, event.untranslated ?? false);
     }
   }
 }
@@ -153,22 +166,19 @@ export async function fetchCustomerPortal(): Promise<string | null> {
 
 export async function downloadPdf(
   segments: { timestamp: string; text: string }[],
-  videoId?: string
+  videoId?: string,
+  transcriptId?: string
 ): Promise<void> {
-  const res = await fetch(`${API_URL}/video/pdf/`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ segments, video_id: videoId }),
-    credentials: "include",
-  });
+  const res = await postTranscript("/video/pdf/", { video_id: videoId }, transcriptId, { segments });
 
   if (!res.ok) {
     throw new Error(`PDF download failed: ${res.status}`);
   }
 
   const disposition = res.headers.get("Content-Disposition") || "";
-  const match = disposition.match(/filename="?([^"]+)"?/);
-  const filename = match?.[1] || "transcript.pdf";
+  const encoded = disposition.match(/filename\*=UTF-8''([^;]+)/);
+  const match = disposition.match(/filename="?([^";]+)"?/);
+  const filename = (encoded && decodeURIComponent(encoded[1])) || match?.[1] || "transcript.pdf";
 
   const blob = await res.blob();
   const url = URL.createObjectURL(blob);
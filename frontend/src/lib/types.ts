@@ -10,6 +10,7 @@ export interface TranscriptResult {
   language: string;
   segments: Segment[];
   word_count: number;
+  transcript_id?: string;
 }
 
 export interface TranscriptError {
@@ -29,6 +30,7 @@ export interface TranslateResponse {
 
 export interface TranslateChunkEvent {
   translation?: string;
+  untranslated?: boolean;
   done?: boolean;
   error?: string;
 }
@@ -1,6 +1,8 @@
 #  uvicorn main:app --reload
 # cd frontend   npm run dev
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
@@ -11,8 +13,21 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from routes import all_routes
+from routes.video_transcript_premium import job_queue
+from routes.responses import ScopedGZipMiddleware
+from services.video_metadata import close_client as close_metadata_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    await close_metadata_client()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ScopedGZipMiddleware)
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=["*"])
 app.add_middleware(SessionMiddleware, secret_key=os.getenv("JWT_SECRET"))
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
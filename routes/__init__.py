@@ -6,6 +6,9 @@ from .translate_router import router as translate_router
 from .auth import router as auth_router
 from .language_detect import router as language_router
 from .payments import router as payments_router
+from .metrics import router as metrics_router
+from .batch_transcript import router as batch_router
+from .export_router import router as export_router
 
 
-all_routes = [video_router, premium_router, pdf_router, summary_router, translate_router, auth_router, language_router, payments_router]
\ No newline at end of file
+all_routes = [video_router, premium_router, pdf_router, summary_router, translate_router, auth_router, language_router, payments_router, metrics_router, batch_router, export_router]
\ No newline at end of file
@@ -0,0 +1,117 @@
+import os
+import re
+import json
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+import yt_dlp
+from dotenv import load_dotenv
+
+from .utils import extract_video_id
+from .video_transcript import get_caption_transcript
+from dependencies.auth import require_premium
+from services.offload import run_blocking
+
+load_dotenv()
+
+router = APIRouter()
+
+BATCH_MAX_VIDEOS = int(os.getenv("BATCH_MAX_VIDEOS", 200))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 8))
+
+
+class BatchRequest(BaseModel):
+    video_urls: list[str] = []
+    playlist_url: str | None = None
+    language: str = "en"
+
+
+_VIDEO_ID = re.compile(r"[\w-]{11}")
+
+
+def _resolve_playlist(playlist_url: str) -> list[str]:
+    """List a playlist's video ids without fetching each video page. Blocking.
+
+    Flat extraction of a channel URL yields its tabs (Videos, Shorts, ...)
+    rather than videos; only entries that are videos are kept.
+    """
+    ydl_opts = {"extract_flat": "in_playlist", "quiet": True, "no_warnings": True}
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(playlist_url, download=False)
+    if info.get("_type") != "playlist":
+        raise ValueError("not a playlist URL")
+    return [
+        entry["id"] for entry in info.get("entries") or []
+        if entry.get("ie_key", "Youtube") == "Youtube" and _VIDEO_ID.fullmatch(entry.get("id") or "")
+    ]
+
+
+@router.post("/video/batch")
+async def get_batch_transcripts(request: BatchRequest, user=Depends(require_premium)):
+    # (url, video_id) per input item: video_urls first, then playlist entries.
+    items = [(url, extract_video_id(url)) for url in request.video_urls]
+    if request.playlist_url:
+        try:
+            playlist_ids = await run_blocking("ytdlp", _resolve_playlist, request.playlist_url)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not read playlist: {e}")
+        items += [(f"https://www.youtube.com/watch?v={video_id}", video_id) for video_id in playlist_ids]
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No videos to transcribe")
+    if len(items) > BATCH_MAX_VIDEOS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_VIDEOS} videos per batch")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch(video_id: str) -> dict:
+        async with semaphore:
+            return await get_caption_transcript(video_id, request.language)
+
+    async def report(index: int, url: str, video_id: str | None, fetched: asyncio.Task | None) -> dict:
+        result = {"index": index, "url": url}
+        if fetched is None:
+            return {**result, "success": False, "error": "Invalid YouTube URL"}
+        try:
+            entry = await fetched
+        except Exception as e:
+            return {**result, "success": False, "video_id": video_id, "error": str(e)}
+        return {
+            **result,
+            "success": True,
+            "video_id": video_id,
+            "source": "captions",
+            "language": request.language,
+            "segments": entry["segments"],
+            "word_count": entry["word_count"],
+        }
+
+    async def ndjson_generator():
+        # A video listed twice is fetched once and reported at both positions.
+        video_ids = dict.fromkeys(video_id for _, video_id in items if video_id)
+        fetches = {video_id: asyncio.create_task(fetch(video_id)) for video_id in video_ids}
+        reports = [
+            asyncio.create_task(report(i, url, video_id, fetches.get(video_id)))
+            for i, (url, video_id) in enumerate(items)
+        ]
+        failed = 0
+        try:
+            # Emit each item as soon as it completes; `index` is its position in the input.
+            for next_done in asyncio.as_completed(reports):
+                result = await next_done
+                failed += not result["success"]
+                yield json.dumps(result) + "\n"
+        finally:
+            for task in [*fetches.values(), *reports]:
+                task.cancel()
+        yield json.dumps({"done": True, "total": len(reports), "failed": failed}) + "\n"
+
+    return StreamingResponse(
+        ndjson_generator(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
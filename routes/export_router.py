@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from .utils import TranscriptRequest, extract_video_id, merge_segments, content_disposition, resolve_transcript
+from dependencies.auth import get_current_user
+from services.export import WRITERS, render_export, cues_from_segments, cues_from_timeline
+from services.transcript_cache import get_cached_transcript
+from services.video_metadata import get_video_metadata
+
+router = APIRouter()
+
+
+class ExportRequest(TranscriptRequest):
+    video_id: str | None = None
+    format: str = "srt"
+
+
+async def _title_for(video_id: str | None) -> str:
+    metadata = await get_video_metadata(video_id) if video_id else None
+    return (metadata or {}).get("title") or "Transcript"
+
+
+def _export_response(fmt: str, cues, title: str) -> StreamingResponse:
+    _, media_type, extension = WRITERS[fmt]
+    return StreamingResponse(
+        render_export(fmt, cues, title),
+        media_type=media_type,
+        headers={"Content-Disposition": content_disposition(title, extension)},
+    )
+
+
+def _check_format(fmt: str):
+    if fmt not in WRITERS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(WRITERS)}")
+
+
+@router.post("/video/export")
+async def export_segments(request: ExportRequest):
+    """Export segments sent by the client (e.g. a premium audio transcript)."""
+    _check_format(request.format)
+    video_id, segments = await resolve_transcript(request)
+    title = await _title_for(request.video_id or video_id)
+    return _export_response(request.format, cues_from_segments(segments), title)
+
+
+@router.get("/video/export")
+async def export_cached_transcript(
+    video_url: str,
+    language: str = "en",
+    format: str = "srt",
+    segment_duration: float = 30.0,
+    user = Depends(get_current_user)):
+    """Export an already-fetched caption transcript straight from the cache.
+
+    Subtitle formats use the raw caption timing; the reading formats use
+    `segment_duration` groupings.
+    """
+    if not user:
+        raise HTTPException(status_code=401, detail="Sign in required")
+    _check_format(format)
+
+    video_id = extract_video_id(video_url)
+    entry = await get_cached_transcript(video_id, language)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Transcript not loaded yet, fetch it with /video/ first")
+
+    if format in ("srt", "vtt"):
+        cues = cues_from_timeline(entry["timeline"])
+    else:
+        segments = entry["segments"]
+        if segment_duration != 30.0:
+            segments = merge_segments(entry["timeline"], target_duration=segment_duration)
+        cues = cues_from_segments(segments)
+    return _export_response(format, cues, await _title_for(video_id))
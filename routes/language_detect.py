@@ -1,38 +1,48 @@
-from fastapi import APIRouter
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.proxies import WebshareProxyConfig
-
-import os
-from dotenv import load_dotenv
-load_dotenv()
+from fastapi import APIRouter, HTTPException
 
 from .utils import extract_video_id
+from services.offload import run_blocking
+from services.youtube_client import list_transcripts
+from services.single_flight import single_flight
+from services.language_cache import get_cached_transcript_list, cache_transcript_list
 
 router = APIRouter()
 
 
+async def _load_transcript_list(video_id: str):
+    transcript_list = await run_blocking("youtube", list_transcripts, video_id)
+    cache_transcript_list(video_id, transcript_list)
+    return transcript_list
+
+
+async def get_transcript_list(video_id: str):
+    """Cached TranscriptList for the video, listing it (once, however many callers) on a miss."""
+    transcript_list = get_cached_transcript_list(video_id)
+    if transcript_list is None:
+        transcript_list = await single_flight.do(("languages", video_id), _load_transcript_list, video_id)
+    return transcript_list
+
+
+def describe_languages(transcript_list) -> list[dict]:
+    return [
+        {"code": t.language_code, "name": t.language}
+        for t in transcript_list
+    ]
+
+
 @router.get("/video/languages")
 async def get_video_languages(video_url: str):
     try:
         video_id = extract_video_id(video_url)
-        ytt_api = YouTubeTranscriptApi(
-            proxy_config=WebshareProxyConfig(
-                proxy_username=os.getenv("WEBSHARE_PROXY_USERNAME"),
-                proxy_password=os.getenv("WEBSHARE_PROXY_PASSWORD"),
-            )
-        )
-        transcript_list = ytt_api.list(video_id)
-
-        languages = [
-            {"code": t.language_code, "name": t.language}
-            for t in transcript_list
-        ]
+        languages = describe_languages(await get_transcript_list(video_id))
 
         return {
             "success": True,
             "languages": languages,
             "default": languages[0]["code"] if languages else None,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[language_detect] FAILED for video_url={video_url}: {type(e).__name__}: {e}")
         return {"success": False, "languages": [], "default": None, "error": str(e)}
@@ -0,0 +1,50 @@
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from dotenv import load_dotenv
+
+from database.connection import pool_stats
+
+from services.transcript_cache import transcript_cache
+from services.offload import offload_stats
+from services.youtube_client import client_stats
+from services.single_flight import single_flight
+from services.translation_cache import translation_cache
+from services.summary_cache import summary_cache
+from services.language_cache import language_cache
+from services.user_cache import user_cache
+from services.video_metadata import metadata_stats
+from .video_transcript_premium import job_queue
+
+load_dotenv()
+
+# Metrics expose cache paths and pool/job internals, so they are off unless a
+# token is configured, and then require it as a bearer token.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter()
+
+
+def require_metrics_token(authorization: str | None = Header(default=None)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not authorization or not secrets.compare_digest(authorization.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+@router.get("/metrics/", dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    return {
+        "transcript_cache": transcript_cache.stats(),
+        "offload": offload_stats(),
+        "youtube_client": client_stats(),
+        "single_flight": single_flight.stats(),
+        "translation_cache": translation_cache.stats(),
+        "summary_cache": summary_cache.stats(),
+        "premium_jobs": job_queue.stats(),
+        "language_cache": language_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "db_pool": pool_stats(),
+        "video_metadata": metadata_stats(),
+    }
@@ -11,6 +11,7 @@ from sqlalchemy import select
 from database.connection import get_db
 from database.orm import User, Subscription
 from dependencies.auth import get_current_user
+from services.user_cache import invalidate_user
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +129,7 @@ async def handle_webhook(request: Request, db: AsyncSession = Depends(get_db)):
 
         db.add(user)
         await db.commit()
+        invalidate_user(user.id)
         logger.info(f"checkout.session.completed → user {user_id} upgraded to premium")
 
     # ── customer.subscription.updated ──────────────────────────────
@@ -159,6 +161,8 @@ async def handle_webhook(request: Request, db: AsyncSession = Depends(get_db)):
             db.add(user)
         db.add(subscription)
         await db.commit()
+        if user:
+            invalidate_user(user.id)
         logger.info(f"subscription.updated → {stripe_sub_id} status={status}")
 
     # ── customer.subscription.deleted ──────────────────────────────
@@ -182,6 +186,8 @@ async def handle_webhook(request: Request, db: AsyncSession = Depends(get_db)):
             db.add(user)
         db.add(subscription)
         await db.commit()
+        if user:
+            invalidate_user(user.id)
         logger.info(f"subscription.deleted → {stripe_sub_id} cancelled")
 
     return {"ok": True}
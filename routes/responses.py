@@ -0,0 +1,28 @@
+import os
+
+from starlette.middleware.gzip import GZipMiddleware
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RESPONSE_GZIP_MIN_BYTES = int(os.getenv("RESPONSE_GZIP_MIN_BYTES", 1024))
+# Level 9 costs several times the CPU of 5 for a few percent smaller JSON.
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 5))
+# Large, highly compressible payloads. Other routes are tiny, event streams, or
+# already-compressed PDFs, where gzip only burns CPU.
+COMPRESSED_PATHS = ("/video/", "/video/premium/", "/video/segments", "/video/export")
+
+
+class ScopedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware limited to an explicit set of paths."""
+
+    def __init__(self, app, paths=COMPRESSED_PATHS, minimum_size: int = RESPONSE_GZIP_MIN_BYTES,
+                 compresslevel: int = RESPONSE_GZIP_LEVEL):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -1,23 +1,56 @@
+import json
 import logging
-from pydantic import BaseModel
-from agents import summary_agent
+from services.summarization import summarize, stream_summary
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from dependencies.auth import require_premium
+from .utils import TranscriptRequest, resolve_transcript
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-class SummaryRequest(BaseModel):
-    transcription: str
+class SummaryRequest(TranscriptRequest):
+    transcription: str | None = None  # with `segments`, lets long transcripts split on segment boundaries
+
+
+async def _summary_input(request: SummaryRequest) -> tuple[str, list[str] | None]:
+    if request.transcription is not None and not request.transcript_id:
+        return request.transcription, [seg.text for seg in request.segments] if request.segments else None
+    _, segments = await resolve_transcript(request)
+    segment_texts = [seg["text"] for seg in segments]
+    return " ".join(segment_texts), segment_texts
+
 
 @router.post("/video/summary")
 async def create_video_summary(request: SummaryRequest, user=Depends(require_premium)):
+    transcription, segment_texts = await _summary_input(request)
     try:
-        summary = await summary_agent.ainvoke({"messages" : [{"role" : "user" , "content" : request.transcription}]})
-        result = summary["messages"][-1].content
-        return {"summary" : result}
+        result, stats = await summarize(transcription, segment_texts)
+        return {"summary" : result, "stats" : stats}
     except Exception:
         logger.exception("Summary generation failed")
-        raise HTTPException(status_code=502, detail="Summary service temporarily unavailable")
\ No newline at end of file
+        raise HTTPException(status_code=502, detail="Summary service temporarily unavailable")
+
+
+@router.post("/video/summary/stream")
+async def stream_video_summary(request: SummaryRequest, user=Depends(require_premium)):
+    transcription, segment_texts = await _summary_input(request)
+
+    async def event_generator():
+        stats = {}
+        try:
+            async for delta in stream_summary(transcription, segment_texts, stats):
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+        except Exception:
+            logger.exception("Summary stream failed")
+            yield f"data: {json.dumps({'error': 'Summary service temporarily unavailable'})}\n\n"
+            return
+        yield f"data: {json.dumps({'done': True, 'stats': stats})}\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
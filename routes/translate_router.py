@@ -1,39 +1,34 @@
 import json
 import logging
-from typing import List
-from pydantic import BaseModel
 from fastapi import APIRouter, Depends
 from dependencies.auth import require_premium
 from fastapi.responses import StreamingResponse
-from agents.translate_agent import translate
+from services.translation import translate_batches
+from .utils import TranscriptRequest, resolve_transcript
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-CHUNK_SIZE = 1
 
-class Segment(BaseModel):
-    timestamp: str
-    text: str
-
-class TranslateStreamRequest(BaseModel):
-    segments: List[Segment]
+class TranslateStreamRequest(TranscriptRequest):
     language: str
 
 @router.post("/video/translate")
 async def stream_video_translation(request: TranslateStreamRequest, user=Depends(require_premium)):
+    _, segments = await resolve_transcript(request)
+
     async def event_generator():
-        for i in range(0, len(request.segments), CHUNK_SIZE):
-            try:
-                chunk_segments = request.segments[i : i + CHUNK_SIZE]
-                chunk_text = " ".join(seg.text for seg in chunk_segments)
-                translated = await translate(chunk_text, request.language)
+        failed = 0
+        texts = [seg["text"] for seg in segments]
+        # One event per segment, in order.
+        async for source, translated in translate_batches(texts, request.language):
+            if translated is None:
+                # Keep the stream going: fall back to the source text for this segment.
+                failed += 1
+                yield f"data: {json.dumps({'translation': source, 'untranslated': True})}\n\n"
+            else:
                 yield f"data: {json.dumps({'translation': translated})}\n\n"
-            except Exception:
-                logger.exception("Translation chunk failed")
-                yield f"data: {json.dumps({'error': 'Translation service temporarily unavailable'})}\n\n"
-                return
-        yield f"data: {json.dumps({'done': True})}\n\n"
+        yield f"data: {json.dumps({'done': True, 'untranslated_segments': failed})}\n\n"
 
     return StreamingResponse(
         event_generator(),
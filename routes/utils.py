@@ -1,4 +1,18 @@
+import os
 import re
+import unicodedata
+from urllib.parse import quote
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from itsdangerous import URLSafeSerializer, BadSignature
+from pydantic import BaseModel
+
+from services.transcript_cache import get_cached_transcript
+from services.audio_store import load_audio_transcript
+from database.connection import SessionLocal
+
+load_dotenv()
 
 
 def extract_video_id(url: str) -> str | None:
@@ -23,31 +37,111 @@ def format_timestamp(seconds: float) -> str:
     return f"({mins:02d}:{secs:02d})"
 
 
-def merge_segments(snippets, target_duration: float = 30.0) -> list[dict]:
-    """Merge small segments into ~30 second chunks.
+def safe_filename(title: str, extension: str = "pdf") -> str:
+    """Create a filesystem-safe filename from a video title."""
+    name = re.sub(r"[^\w\s-]", "", title)
+    name = re.sub(r"\s+", "_", name.strip())
+    if not name:
+        return f"transcript.{extension}"
+    return f"{name[:80]}_Transcript.{extension}"
+
+
+def content_disposition(title: str, extension: str = "pdf") -> str:
+    """Attachment header for a download named after a video title, in any script.
+
+    Header values are sent as latin-1, so `filename` is an ASCII fallback and
+    the real name goes percent-encoded in `filename*` (RFC 6266).
+    """
+    ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    fallback = safe_filename(ascii_title, extension)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(safe_filename(title, extension))}"
+
+
+def iter_merged_segments(snippets, target_duration: float = 30.0):
+    """Yield ~30 second segments one by one, as soon as each is complete.
 
     Works with both YouTube transcript snippets (has .start, .text)
     and Deepgram utterances (has .start, .transcript).
     """
+    current_start = None
+    current_texts = []
+
+    for snippet in snippets:
+        if current_start is None:
+            current_start = snippet.start
+        text = getattr(snippet, 'text', None) or getattr(snippet, 'transcript', '')
+        current_texts.append(text)
+
+        elapsed = snippet.start - current_start
+        if elapsed >= target_duration:
+            yield {
+                "timestamp": format_timestamp(current_start),
+                "text": " ".join(current_texts)
+            }
+            current_start = snippet.start
+            current_texts = []
+
+    if current_texts:
+        yield {
+            "timestamp": format_timestamp(current_start),
+            "text": " ".join(current_texts)
+        }
+
+
+def merge_segments(snippets, target_duration: float = 30.0) -> list[dict]:
+    """Merge small segments into ~30 second chunks."""
+    return list(iter_merged_segments(snippets, target_duration))
+
+
+_SENTENCE_END = (".", "!", "?", "…")
+# Auto-generated captions have no punctuation; without a cap, by="sentence"
+# would put the whole transcript in one segment.
+_SENTENCE_MAX_FACTOR = 2
+
+
+def regroup_segments(snippets, by: str = "duration", value: float = 30.0) -> list[dict]:
+    """Group raw snippets into segments in a single pass.
+
+    by="duration": close a segment once it spans `value` seconds (same as merge_segments).
+    by="words":    close a segment once it holds `value` words.
+    by="sentence": close a segment at the first sentence end after `value` seconds,
+                   or at 2 x `value` seconds if no sentence ends by then.
+    """
+    if by == "duration":
+        return merge_segments(snippets, target_duration=value)
+    if by not in ("words", "sentence"):
+        raise ValueError(f"Unknown grouping: {by}")
     if not snippets:
         return []
 
     merged = []
-    current_start = snippets[0].start
+    current_start = None
     current_texts = []
+    current_words = 0
 
     for snippet in snippets:
+        if current_start is None:
+            current_start = snippet.start
         text = getattr(snippet, 'text', None) or getattr(snippet, 'transcript', '')
         current_texts.append(text)
+        current_words += len(text.split())
 
-        elapsed = snippet.start - current_start
-        if elapsed >= target_duration:
+        if by == "words":
+            done = current_words >= value
+        else:
+            elapsed = snippet.start - current_start
+            done = elapsed >= value and (
+                text.rstrip().endswith(_SENTENCE_END) or elapsed >= value * _SENTENCE_MAX_FACTOR
+            )
+
+        if done:
             merged.append({
                 "timestamp": format_timestamp(current_start),
                 "text": " ".join(current_texts)
             })
-            current_start = snippet.start
+            current_start = None
             current_texts = []
+            current_words = 0
 
     if current_texts:
         merged.append({
@@ -56,3 +150,66 @@ def merge_segments(snippets, target_duration: float = 30.0) -> list[dict]:
         })
 
     return merged
+
+
+# Signed, so a handle can only name a transcript this server actually handed out
+# (premium audio transcripts included).
+_serializer = URLSafeSerializer(os.getenv("COOKIE_SECRET_KEY"), salt="transcript-handle")
+
+
+def make_transcript_id(source: str, video_id: str, language: str, segment_duration: float = 30.0) -> str:
+    return _serializer.dumps({"s": source, "v": video_id, "l": language, "d": segment_duration})
+
+
+async def load_transcript_by_id(transcript_id: str) -> dict:
+    """Resolve a transcript handle to {"video_id", "segments"}.
+
+    Raises 404 once a caption transcript has left the cache.
+    """
+    try:
+        ref = _serializer.loads(transcript_id)
+    except BadSignature:
+        raise HTTPException(status_code=400, detail="Invalid transcript_id")
+
+    video_id, segment_duration = ref["v"], ref["d"]
+    if ref["s"] == "captions":
+        entry = await get_cached_transcript(video_id, ref["l"])
+        if not entry:
+            raise HTTPException(status_code=404, detail="Transcript expired, send the segments instead")
+        segments = entry["segments"]
+        if segment_duration != 30.0:
+            segments = merge_segments(entry["timeline"], target_duration=segment_duration)
+    else:
+        async with SessionLocal() as db:
+            stored = await load_audio_transcript(db, video_id)
+        if not stored:
+            raise HTTPException(status_code=404, detail="Transcript expired, send the segments instead")
+        segments = merge_segments(stored[0], target_duration=segment_duration)
+
+    return {"video_id": video_id, "segments": segments}
+
+
+class Segment(BaseModel):
+    timestamp: str
+    text: str
+
+
+class TranscriptRequest(BaseModel):
+    """Request body naming the transcript to work on.
+
+    `transcript_id` is the handle returned by /video/ and /video/premium/, so
+    the server reuses its own copy. `segments` is the fallback: clients send
+    them when they have no handle, or when the handle came back 404.
+    """
+    segments: list[Segment] | None = None
+    transcript_id: str | None = None
+
+
+async def resolve_transcript(request: TranscriptRequest) -> tuple[str | None, list[dict]]:
+    """(video_id, segments) for a TranscriptRequest; video_id is only known from a handle."""
+    if request.transcript_id:
+        transcript = await load_transcript_by_id(request.transcript_id)
+        return transcript["video_id"], transcript["segments"]
+    if request.segments is None:
+        raise HTTPException(status_code=400, detail="Send either transcript_id or segments")
+    return None, [seg.model_dump() for seg in request.segments]
@@ -1,18 +1,25 @@
 from fastapi import APIRouter, Request, Response, HTTPException, Depends
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.proxies import WebshareProxyConfig
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timezone
 
-from .utils import extract_video_id, merge_segments
+from .language_detect import get_transcript_list, describe_languages
+from .utils import extract_video_id, merge_segments, iter_merged_segments, regroup_segments, make_transcript_id
 
+import orjson
 from itsdangerous import URLSafeSerializer, BadSignature
+from youtube_transcript_api import YouTubeRequestFailed
 
 import os
 from dotenv import load_dotenv
 
 from dependencies.auth import get_current_user
 from database import get_db
+from services.transcript_cache import get_cached_transcript, cache_transcript, get_encoded_segments
+from services.offload import run_blocking
+from services.youtube_client import fetch_transcript, fetch_listed_transcript
+from services.single_flight import single_flight
+from services.language_cache import invalidate_transcript_list
+from services.usage import consume_unit, refund_unit, FREE_MONTHLY_LIMIT
 
 load_dotenv()
 
@@ -22,12 +29,76 @@ router = APIRouter()
 
 serializer = URLSafeSerializer(COOKIE_SECRET_KEY)
 
+
+async def _fetch_snippets(video_id: str, language: str) -> list:
+    # Going through the (cached) language list means a /video/languages call
+    # followed by /video/ lists the video once instead of twice.
+    transcript_list = await get_transcript_list(video_id)
+    try:
+        transcript = await run_blocking("youtube", fetch_listed_transcript, transcript_list, [language])
+    except YouTubeRequestFailed:
+        # The caption URL in the cached list may have expired; start over.
+        invalidate_transcript_list(video_id)
+        transcript = await run_blocking("youtube", fetch_transcript, video_id, [language])
+    return transcript.snippets
+
+
+async def get_caption_snippets(video_id: str, language: str) -> list:
+    """Raw caption snippets from YouTube, one fetch however many callers."""
+    return await single_flight.do(("snippets", video_id, language), _fetch_snippets, video_id, language)
+
+
+async def _load_transcript(video_id: str, language: str) -> dict:
+    snippets = await get_caption_snippets(video_id, language)
+    segments = merge_segments(snippets)
+    word_count = sum(len(s.text.split()) for s in snippets)
+    return await cache_transcript(video_id, language, snippets, segments, word_count)
+
+
+async def get_caption_transcript(video_id: str, language: str) -> dict:
+    """Cached transcript entry, fetching it (once, however many callers) on a miss."""
+    entry = await get_cached_transcript(video_id, language)
+    if not entry:
+        entry = await single_flight.do(("transcript", video_id, language), _load_transcript, video_id, language)
+    return entry
+
+
+async def _stream_segments(video_id: str, language: str, snippets, cached: bool,
+                           segment_duration: float, trailer: dict):
+    """One SSE event per merged segment, then the trailer with the word count.
+
+    Segments are merged from the raw snippets as they are sent, so the first
+    one goes out before the rest of a long transcript is merged or counted.
+    A transcript fetched for this stream is cached after the last event.
+    """
+    # Default-grouped segments of a fresh transcript are kept for the cache entry.
+    keep = not cached and segment_duration == 30.0
+    segments = []
+    count = 0
+    word_count = 0
+    for segment in iter_merged_segments(snippets, target_duration=segment_duration):
+        count += 1
+        word_count += len(segment["text"].split())
+        if keep:
+            segments.append(segment)
+        yield b"data: " + orjson.dumps(segment) + b"\n\n"
+    trailer["word_count"] = word_count
+    trailer["segment_count"] = count
+    yield b"data: " + orjson.dumps(trailer) + b"\n\n"
+
+    if not cached:
+        await cache_transcript(video_id, language, snippets, segments if keep else merge_segments(snippets), word_count)
+
+
 @router.post("/video/")
 async def get_video_transcript(
     request: Request,
     response : Response,
     video_url: str,
     language: str = "en",
+    segment_duration: float = 30.0,
+    include_languages: bool = False,
+    stream: bool = False,
     user = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)):
 
@@ -57,43 +128,102 @@ async def get_video_transcript(
             samesite="lax"
         )
 
-    if user and user.tier != "premium":
-        now = datetime.now(timezone.utc)
-        if user.usage_reset_at.month != now.month or user.usage_reset_at.year != now.year:
-            user.usage_count = 0
-            user.usage_reset_at = now
-
-        limit = 20
-        if user.usage_count >= limit:
-            raise HTTPException(status_code=429, detail=f"You've used all {limit} free transcriptions this month. Upgrade to Premium for unlimited access.")
-
-        user.usage_count += 1
-        db.add(user)
-        await db.commit()
+    metered = user is not None and user.tier != "premium"
+    remaining = None
+    if metered:
+        remaining = await consume_unit(db, user.id)
+        if remaining is None:
+            raise HTTPException(status_code=429, detail=f"You've used all {FREE_MONTHLY_LIMIT} free transcriptions this month. Upgrade to Premium for unlimited access.")
 
 
     try:
         video_id = extract_video_id(video_url)
-        ytt_api = YouTubeTranscriptApi(
-            proxy_config=WebshareProxyConfig(
-                proxy_username=os.getenv("WEBSHARE_PROXY_USERNAME"),
-                proxy_password=os.getenv("WEBSHARE_PROXY_PASSWORD"),
+
+        if stream:
+            entry = await get_cached_transcript(video_id, language)
+            snippets = entry["timeline"] if entry else await get_caption_snippets(video_id, language)
+            trailer = {
+                "done": True,
+                "success": True,
+                "video_id": video_id,
+                "source": "captions",
+                "language": language,
+                "transcript_id": make_transcript_id("captions", video_id, language, segment_duration),
+            }
+            if include_languages:
+                trailer["languages"] = describe_languages(await get_transcript_list(video_id))
+            if remaining is not None:
+                trailer["remaining_quota"] = remaining
+            streaming_response = StreamingResponse(
+                _stream_segments(video_id, language, snippets, entry is not None, segment_duration, trailer),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
             )
-        )
+            streaming_response.raw_headers.extend(h for h in response.raw_headers if h[0] == b"set-cookie")
+            return streaming_response
 
-        transcript = ytt_api.fetch(video_id, languages=[language])
-        snippets = transcript.snippets
-        segments = merge_segments(snippets)
+        entry = await get_caption_transcript(video_id, language)
 
+        if segment_duration != 30.0:
+            segments = merge_segments(entry["timeline"], target_duration=segment_duration)
+        else:
+            segments = get_encoded_segments(entry)
 
-        return {
+        result = {
             "success": True,
             "video_id": video_id,
             "source": "captions",
             "language": language,
             "segments": segments,
-            "word_count": sum(len(s.text.split()) for s in snippets),
+            "word_count": entry["word_count"],
+            "transcript_id": make_transcript_id("captions", video_id, language, segment_duration),
         }
+        if include_languages:
+            result["languages"] = describe_languages(await get_transcript_list(video_id))
+        if remaining is not None:
+            result["remaining_quota"] = remaining
+
+        # Serialized with orjson directly, skipping jsonable_encoder. A returned
+        # Response bypasses the injected one, so carry its cookie over.
+        fast_response = ORJSONResponse(result)
+        fast_response.raw_headers.extend(h for h in response.raw_headers if h[0] == b"set-cookie")
+        return fast_response
+    except HTTPException:
+        if metered:
+            await refund_unit(db, user.id)
+        raise
     except Exception as e:
         print(f"  FAILED: {type(e).__name__}: {e}")
+        if metered:
+            await refund_unit(db, user.id)
         return {"success": False, "error": str(e)}
+
+
+@router.get("/video/segments")
+async def resegment_video_transcript(
+    video_url: str,
+    language: str = "en",
+    by: str = "duration",
+    value: float = 30.0,
+    user = Depends(get_current_user)):
+    """Regroup an already-fetched transcript from its cached snippets — never calls YouTube."""
+    if not user:
+        raise HTTPException(status_code=401, detail="Sign in required")
+    if by not in ("duration", "words", "sentence"):
+        raise HTTPException(status_code=400, detail="by must be one of: duration, words, sentence")
+    if value <= 0:
+        raise HTTPException(status_code=400, detail="value must be positive")
+
+    video_id = extract_video_id(video_url)
+    entry = await get_cached_transcript(video_id, language)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Transcript not loaded yet, fetch it with /video/ first")
+
+    return ORJSONResponse({
+        "success": True,
+        "video_id": video_id,
+        "source": "captions",
+        "language": language,
+        "segments": regroup_segments(entry["timeline"], by, value),
+        "word_count": entry["word_count"],
+    })
@@ -1,82 +1,159 @@
-from fastapi import APIRouter, Depends
-from deepgram import DeepgramClient
-import yt_dlp
-import os
-import tempfile
+import json
+import asyncio
+import logging
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from dotenv import load_dotenv
 
-from .utils import extract_video_id, merge_segments
+from .utils import extract_video_id, merge_segments, make_transcript_id
 from dependencies.auth import require_premium
+from services.offload import run_blocking
+from services.single_flight import single_flight
+from services.audio_pipeline import resolve_audio, transcribe_audio
+from services.jobs import JobQueue, job_to_dict, PREMIUM_JOB_EVENTS_MAX_SECONDS
+from services.audio_store import load_audio_transcript, save_audio_transcript
+from database import get_db
+from database.connection import SessionLocal
+from database.orm import TranscriptionJob
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 load_dotenv()
 
 
-def _transcribe_with_deepgram(mp3_path: str) -> tuple[list[dict], int]:
-    """Transcribe MP3 file using Deepgram Nova-3."""
-    api_key = os.getenv("DEEPGRAM_API_KEY")
-    if not api_key:
-        raise RuntimeError("DEEPGRAM_API_KEY not found in .env")
+async def _transcribe_video(video_url: str, video_id: str, on_stage=None) -> tuple[list, int]:
+    """Return (utterances, word_count), transcribing only if no stored result exists."""
+    # Short-lived sessions on purpose: don't pin a pooled connection for the
+    # minutes the download and transcription take.
+    async with SessionLocal() as db:
+        stored = await load_audio_transcript(db, video_id)
+    if stored:
+        return stored
 
-    client = DeepgramClient(api_key=api_key, timeout=300.0)
+    if on_stage:
+        await on_stage("resolving")
+    audio = await run_blocking("ytdlp", resolve_audio, video_url)
+    if on_stage:
+        await on_stage("transcribing")
+    utterances, word_count = await transcribe_audio(audio)
 
-    with open(mp3_path, "rb") as audio:
-        buffer_data = audio.read()
-
-    response = client.listen.v1.media.transcribe_file(
-        request=buffer_data,
-        model="nova-3",
-        smart_format=True,
-        punctuate=True,
-        utterances=True,
-        language="en",
-    )
+    try:
+        async with SessionLocal() as db:
+            await save_audio_transcript(db, video_id, utterances, word_count, audio["duration"])
+    except Exception:
+        logger.exception("Could not store audio transcript for %s", video_id)
+    return utterances, word_count
 
-    utterances = response.results.utterances
-    segments = merge_segments(utterances)
 
-    full_text = response.results.channels[0].alternatives[0].transcript
-    word_count = len(full_text.split())
+def _shared_transcription(video_url: str, video_id: str, on_stage=None):
+    """One transcription per video, however many requests and jobs are waiting for it.
 
-    return segments, word_count
+    A duplicate Deepgram job costs money and minutes of ffmpeg CPU. The key
+    leaves out the requested language: audio is always transcribed and
+    stored as DEEPGRAM_LANGUAGE, so requests differing only in `language`
+    need the same result.
+    """
+    return single_flight.do(("premium", video_id), _transcribe_video, video_url, video_id, on_stage)
 
 
 @router.post("/video/premium/")
-async def get_video_transcript_premium(video_url: str, language: str = "en", user=Depends(require_premium)):
+async def get_video_transcript_premium(
+    video_url: str,
+    language: str = "en",
+    segment_duration: float = 30.0,
+    user=Depends(require_premium),
+):
     try:
         video_id = extract_video_id(video_url)
+        utterances, word_count = await _shared_transcription(video_url, video_id)
+        segments = merge_segments(utterances, target_duration=segment_duration)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, video_id)
-            ydl_opts = {
-                "format": "bestaudio/best",
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": "mp3",
-                        "preferredquality": "192",
-                    }
-                ],
-                "outtmpl": f"{output_path}.%(ext)s",
-                "quiet": True,
-                "no_warnings": True,
-            }
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.extract_info(video_url, download=True)
-
-            mp3_file = f"{output_path}.mp3"
-            segments, word_count = _transcribe_with_deepgram(mp3_file)
-
-        return {
+        return ORJSONResponse({
             "success": True,
             "video_id": video_id,
             "source": "audio_transcription",
             "language": language,
             "segments": segments,
             "word_count": word_count,
-        }
+            "transcript_id": make_transcript_id("audio", video_id, language, segment_duration),
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"  FAILED: {type(e).__name__}: {e}")
         return {"success": False, "error": str(e)}
+
+
+# ── Background jobs ─────────────────────────────────────────────────
+
+
+async def _run_job(job: TranscriptionJob, set_stage) -> dict:
+    utterances, word_count = await _shared_transcription(job.video_url, job.video_id, set_stage)
+    return {"segments": merge_segments(utterances), "word_count": word_count}
+
+
+job_queue = JobQueue(_run_job)
+
+
+async def _get_own_job(db: AsyncSession, job_id: uuid.UUID, user) -> TranscriptionJob:
+    job = await db.get(TranscriptionJob, job_id)
+    if not job or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/video/premium/jobs")
+async def submit_premium_job(
+    video_url: str,
+    language: str = "en",
+    user=Depends(require_premium),
+    db: AsyncSession = Depends(get_db),
+):
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+    job = await job_queue.submit(db, user.id, video_id, video_url, language)
+    return job_to_dict(job)
+
+
+@router.get("/video/premium/jobs/{job_id}")
+async def get_premium_job(job_id: uuid.UUID, user=Depends(require_premium), db: AsyncSession = Depends(get_db)):
+    return job_to_dict(await _get_own_job(db, job_id, user))
+
+
+@router.get("/video/premium/jobs/{job_id}/events")
+async def stream_premium_job(job_id: uuid.UUID, user=Depends(require_premium), db: AsyncSession = Depends(get_db)):
+    await _get_own_job(db, job_id, user)
+
+    async def event_generator():
+        # Poll the row rather than an in-process channel, so progress is visible
+        # whichever worker process picked the job up.
+        last_stage = None
+        deadline = asyncio.get_running_loop().time() + PREMIUM_JOB_EVENTS_MAX_SECONDS
+        while True:
+            async with SessionLocal() as session:
+                job = await session.get(TranscriptionJob, job_id)
+            if job is None:
+                yield f"data: {json.dumps({'job_id': str(job_id), 'error': 'Job not found'})}\n\n"
+                return
+            if job.stage != last_stage:
+                last_stage = job.stage
+                yield f"data: {json.dumps(job_to_dict(job))}\n\n"
+            if job.status in ("done", "failed"):
+                return
+            if asyncio.get_running_loop().time() >= deadline:
+                # The job keeps going; the client can poll or reconnect.
+                yield f"data: {json.dumps({**job_to_dict(job), 'timed_out': True})}\n\n"
+                return
+            await asyncio.sleep(1)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
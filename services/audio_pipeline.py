@@ -0,0 +1,205 @@
+import os
+import math
+import asyncio
+import tempfile
+import threading
+import subprocess
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import yt_dlp
+from deepgram import DeepgramClient
+from dotenv import load_dotenv
+
+from .offload import run_blocking
+from .ranged_proxy import ranged_url
+
+load_dotenv()
+
+DEEPGRAM_MODEL = "nova-3"
+DEEPGRAM_LANGUAGE = "en"
+AUDIO_CHUNK_BYTES = 64 * 1024
+# Speech models work at 16 kHz mono; Opus at this bitrate is ~10x smaller than
+# the old 192 kbps MP3 and much cheaper to encode.
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_BITRATE = os.getenv("AUDIO_OPUS_BITRATE", "24k")
+
+# Audio longer than this is split into fixed windows transcribed in parallel.
+AUDIO_CHUNKED_MIN_DURATION = float(os.getenv("AUDIO_CHUNKED_MIN_DURATION", 2 * 60 * 60))
+AUDIO_WINDOW_SECONDS = float(os.getenv("AUDIO_WINDOW_SECONDS", 20 * 60))
+# Must exceed the longest utterance so a boundary-straddling one is whole in one window.
+AUDIO_WINDOW_OVERLAP = float(os.getenv("AUDIO_WINDOW_OVERLAP", 15))
+AUDIO_WINDOW_CONCURRENCY = int(os.getenv("AUDIO_WINDOW_CONCURRENCY", 4))
+
+
+@dataclass
+class Utterance:
+    """Deepgram utterance with its start moved to the absolute video timeline."""
+    start: float
+    end: float
+    transcript: str
+
+
+def resolve_audio(video_url: str) -> dict:
+    """Resolve the direct URL of the best audio stream without downloading it. Blocking."""
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "quiet": True,
+        "no_warnings": True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(video_url, download=False)
+    return {
+        "url": info["url"],
+        "http_headers": info.get("http_headers") or {},
+        "duration": info.get("duration"),
+        # yt-dlp sets this for YouTube formats: googlevideo throttles larger requests.
+        "chunk_size": (info.get("downloader_options") or {}).get("http_chunk_size"),
+        "filesize": info.get("filesize"),
+    }
+
+
+@contextmanager
+def _ffmpeg_input(audio: dict):
+    """The URL ffmpeg should read and the headers it must send there."""
+    if audio.get("chunk_size"):
+        with ranged_url(audio["url"], audio["http_headers"], audio["chunk_size"], audio.get("filesize")) as url:
+            yield url, {}
+    else:
+        yield audio["url"], audio["http_headers"]
+
+
+def _ffmpeg_command(url: str, http_headers: dict, start: float | None = None,
+                    duration: float | None = None) -> list[str]:
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error",
+           "-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"]
+    if http_headers:
+        headers = "".join(f"{k}: {v}\r\n" for k, v in http_headers.items())
+        cmd += ["-headers", headers]
+    if start is not None:
+        cmd += ["-ss", str(start)]
+    if duration is not None:
+        cmd += ["-t", str(duration)]
+    cmd += ["-i", url,
+            "-vn", "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE),
+            "-c:a", "libopus", "-b:a", AUDIO_BITRATE, "-application", "voip",
+            "-f", "ogg", "pipe:1"]
+    return cmd
+
+
+def stream_audio(audio: dict, start: float | None = None, duration: float | None = None,
+                 cancelled: threading.Event | None = None):
+    """Yield Opus/Ogg chunks as ffmpeg transcodes them — no temp file, no full buffer.
+
+    Setting `cancelled` aborts the stream, and with it the upload reading it.
+    """
+    # stderr goes to a file: a pipe only read at EOF can fill up (reconnect
+    # warnings on a multi-hour stream) and block ffmpeg, and with it stdout.
+    with _ffmpeg_input(audio) as (url, http_headers), tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            _ffmpeg_command(url, http_headers, start, duration),
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        try:
+            while chunk := proc.stdout.read(AUDIO_CHUNK_BYTES):
+                if cancelled is not None and cancelled.is_set():
+                    raise RuntimeError("Audio stream cancelled")
+                yield chunk
+            if proc.wait() != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"ffmpeg failed: {stderr.read().decode(errors='replace').strip()[-500:]}")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+
+
+def transcribe_stream(chunks, language: str = DEEPGRAM_LANGUAGE):
+    """Upload an audio byte stream to Deepgram and return the utterances. Blocking."""
+    api_key = os.getenv("DEEPGRAM_API_KEY")
+    if not api_key:
+        raise RuntimeError("DEEPGRAM_API_KEY not found in .env")
+
+    client = DeepgramClient(api_key=api_key, timeout=300.0)
+    response = client.listen.v1.media.transcribe_file(
+        request=chunks,
+        model=DEEPGRAM_MODEL,
+        smart_format=True,
+        punctuate=True,
+        utterances=True,
+        language=language,
+    )
+    return response.results.utterances or []
+
+
+def _transcribe_whole(audio: dict) -> list:
+    return transcribe_stream(stream_audio(audio))
+
+
+def _transcribe_window(audio: dict, index: int, cancelled: threading.Event | None = None) -> list[Utterance]:
+    """Transcribe window `index` and keep only utterances starting inside its core.
+
+    Each window is read with AUDIO_WINDOW_OVERLAP of padding on both sides. An
+    utterance crossing a boundary is complete in the window it started in, and
+    its clipped fragment in the neighbouring window starts inside the padding,
+    so it is dropped there.
+    """
+    core_start = index * AUDIO_WINDOW_SECONDS
+    core_end = core_start + AUDIO_WINDOW_SECONDS
+    offset = max(0.0, core_start - AUDIO_WINDOW_OVERLAP)
+    length = core_end + AUDIO_WINDOW_OVERLAP - offset
+
+    kept = []
+    for u in transcribe_stream(stream_audio(audio, start=offset, duration=length, cancelled=cancelled)):
+        start = offset + u.start
+        if core_start <= start < core_end:
+            kept.append(Utterance(start=start, end=offset + (u.end or u.start), transcript=u.transcript))
+    return kept
+
+
+async def _transcribe_windows(audio: dict) -> list[Utterance]:
+    """Each window is its own call on the deepgram pool, at most AUDIO_WINDOW_CONCURRENCY at once.
+
+    The first failure cancels windows still waiting and aborts the uploads
+    in flight, since their results would be thrown away.
+    """
+    windows = math.ceil(audio["duration"] / AUDIO_WINDOW_SECONDS)
+    semaphore = asyncio.Semaphore(AUDIO_WINDOW_CONCURRENCY)
+    cancelled = threading.Event()
+
+    async def transcribe(index: int) -> list[Utterance]:
+        async with semaphore:
+            if cancelled.is_set():
+                raise asyncio.CancelledError()
+            try:
+                return await run_blocking("deepgram", _transcribe_window, audio, index, cancelled)
+            except BaseException:
+                # Set before the slot is released, so no waiting window starts.
+                cancelled.set()
+                raise
+
+    tasks = [asyncio.create_task(transcribe(i)) for i in range(windows)]
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        cancelled.set()
+        for task in tasks:
+            task.cancel()
+    return [u for window in results for u in window]
+
+
+async def transcribe_audio(audio: dict) -> tuple[list, int]:
+    """Pipe the audio stream through ffmpeg into Deepgram. Returns (utterances, word_count).
+
+    Runs on the deepgram offload pool. Very long audio is transcribed as
+    parallel windows, so wall-clock time scales with the number of windows
+    rather than the total duration.
+    """
+    if audio["duration"] and audio["duration"] >= AUDIO_CHUNKED_MIN_DURATION:
+        utterances = await _transcribe_windows(audio)
+    else:
+        utterances = await run_blocking("deepgram", _transcribe_whole, audio)
+    word_count = sum(len(u.transcript.split()) for u in utterances)
+    return utterances, word_count
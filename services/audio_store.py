@@ -0,0 +1,59 @@
+import json
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.orm import AudioTranscript
+from .audio_pipeline import DEEPGRAM_MODEL, DEEPGRAM_LANGUAGE, Utterance
+
+
+def encode_utterances(utterances) -> bytes:
+    """Pack utterances as parallel arrays — far smaller than a list of objects once compressed."""
+    payload = {
+        "start": [round(u.start, 3) for u in utterances],
+        "end": [round(u.end or u.start, 3) for u in utterances],
+        "text": [u.transcript for u in utterances],
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 6)
+
+
+def decode_utterances(blob: bytes) -> list[Utterance]:
+    payload = json.loads(zlib.decompress(blob))
+    return [
+        Utterance(start=start, end=end, transcript=text)
+        for start, end, text in zip(payload["start"], payload["end"], payload["text"])
+    ]
+
+
+async def load_audio_transcript(db: AsyncSession, video_id: str) -> tuple[list[Utterance], int] | None:
+    result = await db.execute(
+        select(AudioTranscript).where(
+            AudioTranscript.video_id == video_id,
+            AudioTranscript.model == DEEPGRAM_MODEL,
+            AudioTranscript.language == DEEPGRAM_LANGUAGE,
+        )
+    )
+    stored = result.scalar_one_or_none()
+    if not stored:
+        return None
+    return decode_utterances(stored.utterances), stored.word_count
+
+
+async def save_audio_transcript(db: AsyncSession, video_id: str, utterances, word_count: int,
+                                duration: float | None = None):
+    # Two workers may finish the same video; whichever lands second is a no-op.
+    await db.execute(
+        insert(AudioTranscript)
+        .values(
+            video_id=video_id,
+            model=DEEPGRAM_MODEL,
+            language=DEEPGRAM_LANGUAGE,
+            utterances=encode_utterances(utterances),
+            word_count=word_count,
+            duration=duration,
+        )
+        .on_conflict_do_nothing(constraint="uq_audio_transcript")
+    )
+    await db.commit()
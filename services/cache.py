@@ -0,0 +1,287 @@
+import os
+import json
+import asyncio
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# How often a disk tier deletes expired files and trims itself to its byte
+# budget. Reads only remove the expired file they hit, so without this a
+# directory grows until the volume fills.
+DISK_CACHE_SWEEP_SECONDS = float(os.getenv("DISK_CACHE_SWEEP_SECONDS", 10 * 60))
+# A writer that died between open() and os.replace() leaves its temp file behind.
+_STALE_TMP_SECONDS = 60 * 60
+
+
+def estimate_size(value) -> int:
+    """Approximate the memory footprint of a JSON-like value by its encoded length."""
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def key_to_str(key) -> str:
+    if isinstance(key, tuple):
+        return ":".join(str(part) for part in key)
+    return str(key)
+
+
+class LRUCache:
+    """In-process LRU cache with a per-entry TTL and a total byte budget.
+
+    Entries are evicted oldest-first once the budget is exceeded, so a burst of
+    huge transcripts can never grow the worker past `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size: int | None = None):
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class DiskCache:
+    """JSON-file store shared by every worker on the same host (or volume).
+
+    `dumps`/`loads` convert values that are not plain JSON on the way in and out.
+    Writes periodically trigger a background sweep that removes expired files
+    and, above `max_bytes`, the oldest-written ones.
+    """
+
+    def __init__(self, directory: str, ttl: float, max_bytes: int | None = None, dumps=None, loads=None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.dumps = dumps or (lambda value: value)
+        self.loads = loads or (lambda value: value)
+        self.hits = 0
+        self.misses = 0
+        self.bytes = None  # as of the last sweep
+        self.removed = 0
+        # The first write sweeps, which also clears files left from earlier runs.
+        self._next_sweep = time.monotonic()
+        self._sweep_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key) -> str:
+        digest = hashlib.sha256(key_to_str(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                os.remove(path)
+                self.misses += 1
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                value = self.loads(json.load(f))
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.dumps(value), f, separators=(",", ":"))
+            os.replace(tmp_path, path)  # atomic, so readers never see a half-written file
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._maybe_sweep()
+
+    def invalidate(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _maybe_sweep(self):
+        now = time.monotonic()
+        if now < self._next_sweep or not self._sweep_lock.acquire(blocking=False):
+            return
+        self._next_sweep = now + DISK_CACHE_SWEEP_SECONDS
+        threading.Thread(target=self._sweep_in_background, name="disk-cache-sweep", daemon=True).start()
+
+    def _sweep_in_background(self):
+        try:
+            self.sweep()
+        except Exception:
+            logger.exception("Disk cache sweep of %s failed", self.directory)
+        finally:
+            self._sweep_lock.release()
+
+    def sweep(self) -> int:
+        """Delete expired entries, then the oldest ones while over `max_bytes`. Returns files removed.
+
+        Safe to run from several processes at once: a file another sweep (or a
+        read) already removed is skipped.
+        """
+        now = time.time()
+        live = []
+        total = 0
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".tmp"):
+                    expired = stat.st_mtime + _STALE_TMP_SECONDS < now
+                else:
+                    expired = stat.st_mtime + self.ttl < now
+                if expired:
+                    removed += _remove_file(path)
+                elif name.endswith(".json"):
+                    live.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+
+        if self.max_bytes is not None and total > self.max_bytes:
+            live.sort()
+            for _, size, path in live:
+                if total <= self.max_bytes:
+                    break
+                removed += _remove_file(path)
+                total -= size
+
+        self.bytes = total
+        self.removed += removed
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "removed": self.removed,
+        }
+
+
+def _remove_file(path: str) -> int:
+    try:
+        os.remove(path)
+    except OSError:
+        return 0
+    return 1
+
+
+class TieredCache:
+    """Memory LRU in front of an optional durable tier; durable hits are promoted.
+
+    Async callers use `aget`/`aset`: the durable tier reads and writes whole
+    files, which for a multi-hour transcript would stall the event loop.
+    """
+
+    def __init__(self, memory: LRUCache, durable=None, sizeof=None):
+        self.memory = memory
+        self.durable = durable
+        self.sizeof = sizeof
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.durable is not None:
+            value = self._promote(key, self.durable.get(key))
+        return value
+
+    async def aget(self, key):
+        value = self.memory.get(key)
+        if value is None and self.durable is not None:
+            value = self._promote(key, await asyncio.to_thread(self.durable.get, key))
+        return value
+
+    def _promote(self, key, value):
+        if value is not None:
+            self.memory.set(key, value, self.sizeof(value) if self.sizeof else None)
+        return value
+
+    def set(self, key, value, size: int | None = None):
+        self._set_memory(key, value, size)
+        if self.durable is not None:
+            self.durable.set(key, value)
+
+    async def aset(self, key, value, size: int | None = None):
+        self._set_memory(key, value, size)
+        if self.durable is not None:
+            await asyncio.to_thread(self.durable.set, key, value)
+
+    def _set_memory(self, key, value, size: int | None):
+        if size is None and self.sizeof:
+            size = self.sizeof(value)
+        self.memory.set(key, value, size)
+
+    def invalidate(self, key):
+        self.memory.invalidate(key)
+        if self.durable is not None:
+            self.durable.invalidate(key)
+
+    def stats(self) -> dict:
+        stats = {"memory": self.memory.stats()}
+        if self.durable is not None:
+            stats["durable"] = self.durable.stats()
+        return stats
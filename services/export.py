@@ -0,0 +1,120 @@
+import re
+import json
+
+# Spoken English averages ~2.5 words/s; used to give the final cue an end time.
+_WORDS_PER_SECOND = 2.5
+_MIN_CUE_SECONDS = 2.0
+# Writers emit one small string per cue; StreamingResponse pulls each item of a
+# sync iterator through the thread pool, so pieces are joined into chunks first.
+EXPORT_CHUNK_CHARS = 64 * 1024
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """Inverse of routes.utils.format_timestamp: "(MM:SS)" or "(H:MM:SS)" -> seconds."""
+    parts = [int(p) for p in re.findall(r"\d+", timestamp)]
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return float(seconds)
+
+
+def _estimated_duration(text: str) -> float:
+    return max(_MIN_CUE_SECONDS, len(text.split()) / _WORDS_PER_SECOND)
+
+
+def cues_from_segments(segments):
+    """Merged segments only carry a start time; each cue ends where the next one starts."""
+    previous = None
+    for seg in segments:
+        start = parse_timestamp(seg["timestamp"])
+        if previous is not None:
+            yield {**previous, "end": max(start, previous["start"])}
+        previous = {"start": start, "text": seg["text"]}
+    if previous is not None:
+        yield {**previous, "end": previous["start"] + _estimated_duration(previous["text"])}
+
+
+def cues_from_timeline(timeline):
+    """Raw caption snippets, with their real durations."""
+    for snippet in timeline:
+        yield {"start": snippet.start, "end": snippet.start + snippet.duration, "text": snippet.text}
+
+
+def _clock(seconds: float, separator: str) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _short_clock(seconds: float) -> str:
+    total = int(seconds)
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def write_srt(cues, title: str):
+    for i, cue in enumerate(cues, start=1):
+        yield f"{i}\n{_clock(cue['start'], ',')} --> {_clock(cue['end'], ',')}\n{cue['text'].strip()}\n\n"
+
+
+def write_vtt(cues, title: str):
+    yield "WEBVTT\n\n"
+    for cue in cues:
+        yield f"{_clock(cue['start'], '.')} --> {_clock(cue['end'], '.')}\n{cue['text'].strip()}\n\n"
+
+
+def write_txt(cues, title: str):
+    yield f"{title}\n\n"
+    for cue in cues:
+        yield f"({_short_clock(cue['start'])})\n{cue['text'].strip()}\n\n"
+
+
+def write_markdown(cues, title: str):
+    yield f"# {title}\n\n"
+    for cue in cues:
+        yield f"**{_short_clock(cue['start'])}** {cue['text'].strip()}\n\n"
+
+
+def write_ndjson(cues, title: str):
+    for cue in cues:
+        yield json.dumps({
+            "start": round(cue["start"], 3),
+            "end": round(cue["end"], 3),
+            "timestamp": f"({_short_clock(cue['start'])})",
+            "text": cue["text"],
+        }, ensure_ascii=False) + "\n"
+
+
+# format -> (writer, media type, file extension)
+WRITERS = {
+    "srt": (write_srt, "application/x-subrip", "srt"),
+    "vtt": (write_vtt, "text/vtt", "vtt"),
+    "txt": (write_txt, "text/plain; charset=utf-8", "txt"),
+    "md": (write_markdown, "text/markdown; charset=utf-8", "md"),
+    "ndjson": (write_ndjson, "application/x-ndjson", "ndjson"),
+}
+
+
+def chunked(pieces, size: int = EXPORT_CHUNK_CHARS):
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def render_export(fmt: str, cues, title: str):
+    """Yield the export as text chunks, rendering cues lazily as they are consumed."""
+    writer, _, _ = WRITERS[fmt]
+    return chunked(writer(cues, title))
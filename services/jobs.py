@@ -0,0 +1,205 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, func
+from dotenv import load_dotenv
+
+from database.connection import SessionLocal
+from database.orm import TranscriptionJob
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PREMIUM_JOB_WORKERS = int(os.getenv("PREMIUM_JOB_WORKERS", 2))
+# Running jobs touch updated_at every heartbeat; one silent for this long
+# belonged to a worker that died.
+PREMIUM_JOB_STALE_SECONDS = int(os.getenv("PREMIUM_JOB_STALE_SECONDS", 5 * 60))
+# Several beats per stale window, so one failed beat doesn't get a live job taken over.
+PREMIUM_JOB_HEARTBEAT_SECONDS = float(os.getenv("PREMIUM_JOB_HEARTBEAT_SECONDS", PREMIUM_JOB_STALE_SECONDS / 3))
+# How often each process looks for stale running jobs to take over.
+PREMIUM_JOB_SWEEP_SECONDS = int(os.getenv("PREMIUM_JOB_SWEEP_SECONDS", 60))
+# A job's event stream closes after this long even if the job is still going.
+PREMIUM_JOB_EVENTS_MAX_SECONDS = int(os.getenv("PREMIUM_JOB_EVENTS_MAX_SECONDS", 60 * 60))
+
+
+def job_to_dict(job: TranscriptionJob) -> dict:
+    data = {
+        "job_id": str(job.id),
+        "video_id": job.video_id,
+        "language": job.language,
+        "status": job.status,
+        "stage": job.stage,
+    }
+    if job.status == "done":
+        data["result"] = job.result
+    if job.status == "failed":
+        data["error"] = job.error
+    return data
+
+
+class JobQueue:
+    """Bounded pool of asyncio workers processing persisted transcription jobs.
+
+    The database row is the source of truth: workers claim a job with a
+    conditional UPDATE, so re-enqueueing the same id (after a restart, or from
+    another process) can never run it twice. `handler(job, set_stage)` does the
+    actual work and returns the result dict.
+    """
+
+    def __init__(self, handler, workers: int = PREMIUM_JOB_WORKERS):
+        self.handler = handler
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._sweeper: asyncio.Task | None = None
+        # Jobs this process claimed and has not finished yet.
+        self._running: set = set()
+
+    async def start(self):
+        if PREMIUM_JOB_HEARTBEAT_SECONDS * 2 > PREMIUM_JOB_STALE_SECONDS:
+            raise RuntimeError(
+                f"PREMIUM_JOB_HEARTBEAT_SECONDS ({PREMIUM_JOB_HEARTBEAT_SECONDS}) must be at most half of "
+                f"PREMIUM_JOB_STALE_SECONDS ({PREMIUM_JOB_STALE_SECONDS}), or running jobs look stale"
+            )
+        try:
+            await self._requeue_unfinished()
+        except Exception:
+            logger.exception("Could not re-queue unfinished transcription jobs")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._sweeper = asyncio.create_task(self._sweep())
+
+    async def stop(self):
+        tasks = self._tasks + ([self._sweeper] if self._sweeper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._sweeper = None
+        # Hand interrupted jobs back right away rather than leaving them
+        # "running" until they go stale.
+        if self._running:
+            try:
+                await self._release(self._running)
+            except Exception:
+                logger.exception("Could not release interrupted transcription jobs")
+            self._running.clear()
+
+    async def submit(self, db, user_id, video_id: str, video_url: str, language: str) -> TranscriptionJob:
+        job = TranscriptionJob(user_id=user_id, video_id=video_id, video_url=video_url, language=language)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def _release(self, job_ids):
+        async with SessionLocal() as db:
+            await db.execute(
+                update(TranscriptionJob)
+                .where(TranscriptionJob.id.in_(list(job_ids)), TranscriptionJob.status == "running")
+                .values(status="queued", stage="queued")
+            )
+            await db.commit()
+        logger.info("Released %d interrupted transcription jobs", len(job_ids))
+
+    async def _requeue_stale(self) -> list:
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=PREMIUM_JOB_STALE_SECONDS)
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(TranscriptionJob)
+                .where(TranscriptionJob.status == "running", TranscriptionJob.updated_at < stale_before)
+                .values(status="queued", stage="queued")
+                .returning(TranscriptionJob.id)
+            )
+            job_ids = result.scalars().all()
+            await db.commit()
+        return job_ids
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(PREMIUM_JOB_SWEEP_SECONDS)
+            try:
+                job_ids = await self._requeue_stale()
+            except Exception:
+                logger.exception("Stale transcription job sweep failed")
+                continue
+            for job_id in job_ids:
+                self._queue.put_nowait(job_id)
+            if job_ids:
+                logger.info("Re-queued %d stale transcription jobs", len(job_ids))
+
+    async def _requeue_unfinished(self):
+        await self._requeue_stale()
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(TranscriptionJob.id)
+                .where(TranscriptionJob.status == "queued")
+                .order_by(TranscriptionJob.created_at)
+            )
+            job_ids = result.scalars().all()
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        if job_ids:
+            logger.info("Re-queued %d unfinished transcription jobs", len(job_ids))
+
+    async def _claim(self, job_id) -> TranscriptionJob | None:
+        async with SessionLocal() as db:
+            claimed = await db.execute(
+                update(TranscriptionJob)
+                .where(TranscriptionJob.id == job_id, TranscriptionJob.status == "queued")
+                .values(status="running")
+            )
+            await db.commit()
+            if claimed.rowcount == 0:
+                return None
+            return await db.get(TranscriptionJob, job_id)
+
+    async def _update(self, job_id, **values):
+        async with SessionLocal() as db:
+            await db.execute(update(TranscriptionJob).where(TranscriptionJob.id == job_id).values(**values))
+            await db.commit()
+
+    async def _heartbeat(self, job_id):
+        # Must outlive transient DB errors: a job that stops beating is taken
+        # over by another process's sweeper and transcribed (and billed) twice.
+        while True:
+            await asyncio.sleep(PREMIUM_JOB_HEARTBEAT_SECONDS)
+            try:
+                await self._update(job_id, updated_at=func.now())
+            except Exception:
+                logger.exception("Heartbeat failed for transcription job %s", job_id)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self._claim(job_id)
+                if job is None:
+                    continue
+
+                async def set_stage(stage: str):
+                    await self._update(job_id, stage=stage)
+
+                self._running.add(job_id)
+                heartbeat = asyncio.create_task(self._heartbeat(job_id))
+                try:
+                    result = await self.handler(job, set_stage)
+                except Exception as e:
+                    logger.exception("Transcription job %s failed", job_id)
+                    await self._update(job_id, status="failed", stage="failed", error=str(e))
+                else:
+                    await self._update(job_id, status="done", stage="done", result=result)
+                finally:
+                    heartbeat.cancel()
+                # Not reached on cancellation: stop() releases the job instead.
+                self._running.discard(job_id)
+            except Exception:
+                logger.exception("Job worker error for %s", job_id)
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {"workers": len(self._tasks), "queued": self._queue.qsize(), "running": len(self._running)}
@@ -0,0 +1,28 @@
+import os
+from dotenv import load_dotenv
+
+from .cache import LRUCache
+
+load_dotenv()
+
+# A TranscriptList holds signed caption URLs that expire, so it is kept briefly,
+# in memory only — long enough to cover a /video/languages call followed by /video/.
+LANGUAGE_CACHE_TTL = float(os.getenv("LANGUAGE_CACHE_TTL", 5 * 60))
+LANGUAGE_CACHE_MAX_BYTES = int(os.getenv("LANGUAGE_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+# Rough footprint of one Transcript (caption URL, names, translation languages).
+_TRANSCRIPT_SIZE = 8 * 1024
+
+language_cache = LRUCache(max_bytes=LANGUAGE_CACHE_MAX_BYTES, ttl=LANGUAGE_CACHE_TTL)
+
+
+def get_cached_transcript_list(video_id: str):
+    return language_cache.get(video_id)
+
+
+def cache_transcript_list(video_id: str, transcript_list):
+    size = _TRANSCRIPT_SIZE * (len(list(transcript_list)) + 1)
+    language_cache.set(video_id, transcript_list, size)
+
+
+def invalidate_transcript_list(video_id: str):
+    language_cache.invalidate(video_id)
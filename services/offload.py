@@ -0,0 +1,85 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class BoundedExecutor:
+    """Thread pool for one class of blocking upstream calls.
+
+    At most `max_workers` calls run at once and at most `max_queue` more may
+    wait; anything beyond that is rejected with a 503 instead of piling up.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"offload-{name}")
+        self.pending = 0   # running + queued
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args, **kwargs):
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please try again in a moment",
+                headers={"Retry-After": "5"},
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        self.pending += 1
+        # Release the slot when the thread finishes, not when the caller stops
+        # waiting — a cancelled request does not stop the work already running.
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self.pending -= 1
+        self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+def _pool_from_env(name: str, workers: int, queue: int) -> BoundedExecutor:
+    prefix = f"OFFLOAD_{name.upper()}"
+    return BoundedExecutor(
+        name,
+        max_workers=int(os.getenv(f"{prefix}_WORKERS", workers)),
+        max_queue=int(os.getenv(f"{prefix}_QUEUE", queue)),
+    )
+
+
+# Caption fetches are short proxy round trips; yt-dlp downloads and Deepgram
+# uploads hold a thread for minutes, so they get small isolated pools. PDF
+# rendering is CPU-bound, so more threads than a couple only add GIL contention.
+pools = {
+    "youtube": _pool_from_env("youtube", workers=16, queue=64),
+    "ytdlp": _pool_from_env("ytdlp", workers=4, queue=8),
+    "deepgram": _pool_from_env("deepgram", workers=4, queue=8),
+    "pdf": _pool_from_env("pdf", workers=2, queue=16),
+}
+
+
+async def run_blocking(pool: str, fn, *args, **kwargs):
+    """Run a synchronous upstream call on the named pool without blocking the event loop."""
+    return await pools[pool].run(fn, *args, **kwargs)
+
+
+def offload_stats() -> dict:
+    return {name: pool.stats() for name, pool in pools.items()}
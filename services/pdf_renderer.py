@@ -0,0 +1,129 @@
+import os
+import copy
+import threading
+from io import BytesIO
+
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf.fonts import SubsetMap
+from fpdf.image_parsing import preload_image
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+LOGO_PATH = os.path.join(_DATA_DIR, "tubetext_logo.png")
+FONTS = [
+    ("DejaVu", "", os.path.join(_DATA_DIR, "fonts", "DejaVuSans.ttf")),
+    ("DejaVu", "B", os.path.join(_DATA_DIR, "fonts", "DejaVuSans-Bold.ttf")),
+]
+
+
+class _Resources:
+    """Fonts and logo parsed once per process.
+
+    `add_font` spends most of its time reading the cmap/hmtx tables into the
+    width and glyph-id maps, and `image` re-decodes the PNG; both results are
+    identical for every document. fpdf2 subsets each font's fontTools object
+    in place while writing the PDF, so every document still opens its own
+    (lazy, in-memory) copy of the font file — only the parsed metrics are shared.
+
+    `install` resets fpdf2's private per-output state, hence the fpdf2 upper
+    bound in pyproject.toml; tests check the output stays byte-identical to
+    a plain FPDF render.
+    """
+
+    def __init__(self):
+        template = FPDF()
+        for family, style, path in FONTS:
+            template.add_font(family, style, path)
+        preload_image(template.image_cache, LOGO_PATH)
+
+        self.fonts = template.fonts
+        self.font_bytes = {}
+        for _, _, path in FONTS:
+            with open(path, "rb") as f:
+                self.font_bytes[path] = f.read()
+        self.images = template.image_cache.images
+        self.icc_profiles = template.image_cache.icc_profiles
+
+    def install(self, pdf: FPDF):
+        for fontkey, template_font in self.fonts.items():
+            # Width and glyph-id maps are only read while laying out text, so
+            # they are shared. Everything output() writes to is per document:
+            # the subset, the fontTools object and the font descriptor (which
+            # gets this document's object id and FontFile2 reference).
+            font = copy.copy(template_font)
+            font.desc = copy.copy(template_font.desc)
+            font._hbfont = None
+            font.ttfont = ttLib.TTFont(
+                BytesIO(self.font_bytes[str(template_font.ttffile)]), recalcTimestamp=False, fontNumber=0, lazy=True
+            )
+            font.subset = SubsetMap(font)
+            font.missing_glyphs = []
+            font.biggest_size_pt = 0
+            pdf.fonts[fontkey] = font
+        for name, info in self.images.items():
+            # Shallow copy: the decoded pixel data is shared, output writes obj_id per document.
+            info = copy.copy(info)
+            info["usages"] = 0
+            pdf.image_cache.images[name] = info
+        pdf.image_cache.icc_profiles.update(self.icc_profiles)
+
+
+_resources: _Resources | None = None
+_resources_lock = threading.Lock()
+
+
+def _get_resources() -> _Resources:
+    global _resources
+    if _resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = _Resources()
+    return _resources
+
+
+def render_transcript_pdf(segments: list[dict], title: str) -> bytes:
+    """Build a branded PDF with timestamped transcript segments. CPU-bound — run through services.offload."""
+    pdf = FPDF()
+    _get_resources().install(pdf)
+    _write_transcript(pdf, segments, title)
+    return bytes(pdf.output())
+
+
+def _write_transcript(pdf: FPDF, segments: list[dict], title: str):
+    pdf.set_auto_page_break(auto=True, margin=20)
+    pdf.add_page()
+
+    # --- Branded header ---
+    pdf.image(LOGO_PATH, x=10, y=10, w=18)
+    pdf.set_xy(30, 14)
+    pdf.set_font("DejaVu", "B", 16)
+    pdf.cell(0, 9, "TubeText", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("DejaVu", "", 9)
+    pdf.set_text_color(140, 140, 140)
+    pdf.set_xy(10, 14)
+    pdf.cell(0, 9, "tubetext.app", align="R", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(4)
+
+    # --- Video title (centered) ---
+    pdf.set_font("DejaVu", "B", 13)
+    pdf.multi_cell(0, 7, title, align="C")
+    pdf.ln(2)
+
+    # --- Divider (below title) ---
+    y = pdf.get_y()
+    pdf.set_draw_color(210, 210, 210)
+    pdf.line(10, y, 200, y)
+    pdf.ln(6)
+
+    # --- Segments ---
+    for seg in segments:
+        # Timestamp — bold black, on its own line
+        pdf.set_font("DejaVu", "B", 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(0, 5, seg.get("timestamp", ""), new_x="LMARGIN", new_y="NEXT")
+
+        # Text — regular black, below timestamp
+        pdf.set_font("DejaVu", "", 10)
+        pdf.multi_cell(0, 5, seg.get("text", ""))
+        pdf.ln(3)
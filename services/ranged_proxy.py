@@ -0,0 +1,137 @@
+import re
+import secrets
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+_READ_BYTES = 64 * 1024
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)")
+_CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)$")
+
+
+class _Source:
+    """An upstream URL that is only ever read in ranged requests of `chunk_size` bytes."""
+
+    def __init__(self, url: str, headers: dict, chunk_size: int, size: int | None = None):
+        self.url = url
+        self.headers = headers
+        self.chunk_size = chunk_size
+        self._size = size
+        self._lock = threading.Lock()
+
+    def size(self, client: httpx.Client) -> int:
+        with self._lock:
+            if self._size is None:
+                response = client.get(self.url, headers={**self.headers, "Range": "bytes=0-0"})
+                response.raise_for_status()
+                match = _CONTENT_RANGE_TOTAL.search(response.headers.get("content-range", ""))
+                self._size = int(match.group(1)) if match else int(response.headers["content-length"])
+        return self._size
+
+    def iter_bytes(self, client: httpx.Client, start: int, end: int):
+        """Yield bytes start..end (inclusive), one upstream request per chunk."""
+        position = start
+        while position <= end:
+            chunk_end = min(position + self.chunk_size - 1, end)
+            headers = {**self.headers, "Range": f"bytes={position}-{chunk_end}"}
+            with client.stream("GET", self.url, headers=headers) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise httpx.HTTPError(f"Upstream ignored the range request ({response.status_code})")
+                for data in response.iter_bytes(_READ_BYTES):
+                    position += len(data)
+                    yield data
+            if position <= chunk_end:
+                raise httpx.HTTPError("Upstream response ended early")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._serve(body=True)
+
+    def do_HEAD(self):
+        self._serve(body=False)
+
+    def _serve(self, body: bool):
+        source = self.server.sources.get(self.path.rsplit("/", 1)[-1])
+        if source is None:
+            self.send_error(404)
+            return
+        try:
+            size = source.size(self.server.client)
+        except (httpx.HTTPError, KeyError, ValueError):
+            self.send_error(502)
+            return
+
+        match = _RANGE.fullmatch(self.headers.get("Range", ""))
+        start = int(match.group(1)) if match else 0
+        end = min(int(match.group(2)), size - 1) if match and match.group(2) else size - 1
+        if start >= size:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(206 if match else 200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        if match:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not body:
+            return
+
+        chunks = source.iter_bytes(self.server.client, start, end)
+        try:
+            for data in chunks:
+                self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg seeked elsewhere or has enough; stop reading upstream
+        except httpx.HTTPError:
+            # Headers are already sent; dropping the connection makes ffmpeg reconnect.
+            self.close_connection = True
+        finally:
+            chunks.close()
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: ThreadingHTTPServer | None = None
+_server_lock = threading.Lock()
+
+
+def _get_server() -> ThreadingHTTPServer:
+    global _server
+    with _server_lock:
+        if _server is None:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+            server.daemon_threads = True
+            server.sources = {}
+            server.client = httpx.Client(timeout=30.0, follow_redirects=True)
+            threading.Thread(target=server.serve_forever, name="ranged-proxy", daemon=True).start()
+            _server = server
+        return _server
+
+
+@contextmanager
+def ranged_url(url: str, headers: dict, chunk_size: int, size: int | None = None):
+    """A loopback URL serving `url` that ffmpeg can read and seek like the original.
+
+    Every request ffmpeg makes is answered with upstream GETs of at most
+    `chunk_size` bytes, the way yt-dlp downloads: googlevideo throttles
+    single large requests to roughly playback speed.
+    """
+    server = _get_server()
+    token = secrets.token_urlsafe(16)
+    server.sources[token] = _Source(url, headers, chunk_size, size)
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/{token}"
+    finally:
+        server.sources.pop(token, None)
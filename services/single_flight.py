@@ -0,0 +1,40 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one in-flight upstream call.
+
+    The first caller starts the work as a task; everyone arriving while it runs
+    awaits the same task and gets the same result (or exception). The task is
+    shielded, so one client disconnecting does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight: dict = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, *args, **kwargs):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter went away.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._inflight), "started": self.started, "coalesced": self.coalesced}
+
+
+# Keys are (endpoint kind, video_id, ...) so the routes can share one instance.
+single_flight = SingleFlight()
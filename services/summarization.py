@@ -0,0 +1,139 @@
+import os
+import re
+import time
+import asyncio
+import logging
+from dotenv import load_dotenv
+from langchain_core.messages import AIMessageChunk
+
+from agents import summary_agent, chunk_summary_agent
+from .translation import estimate_tokens, pack_batches
+from .summary_cache import get_cached_summary, cache_summary
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Transcripts above this size are summarized map-reduce style instead of in one call.
+SUMMARY_MAP_REDUCE_THRESHOLD = int(os.getenv("SUMMARY_MAP_REDUCE_THRESHOLD", 24000))
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", 8000))
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", 4))
+
+
+async def _ask(agent, content: str) -> str:
+    result = await agent.ainvoke({"messages": [{"role": "user", "content": content}]})
+    return result["messages"][-1].content
+
+
+def _split_oversized(unit: str, max_tokens: int) -> list[str]:
+    if estimate_tokens(unit) <= max_tokens:
+        return [unit]
+    words = unit.split()
+    # ~0.75 words per token keeps each piece under the budget.
+    step = max(1, int(max_tokens * 0.75))
+    return [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+
+
+def split_transcript(transcription: str, segment_texts: list[str] | None = None,
+                     max_tokens: int = SUMMARY_CHUNK_TOKENS) -> list[str]:
+    """Split a transcript into chunks under `max_tokens`.
+
+    Chunk boundaries follow merged-segment boundaries when the segments are
+    given, otherwise sentence boundaries.
+    """
+    units = segment_texts or re.split(r"(?<=[.!?])\s+", transcription)
+    pieces = [piece for unit in units if unit.strip() for piece in _split_oversized(unit, max_tokens)]
+    return pack_batches(pieces, max_tokens)
+
+
+def build_reduce_input(notes: list[str]) -> str:
+    sections = "\n\n".join(f"Section {i}:\n{note}" for i, note in enumerate(notes, start=1))
+    return f"The transcription of this video was condensed section by section into the notes below.\n\n{sections}"
+
+
+async def map_sections(chunks: list[str]) -> list[str]:
+    """Summarize each chunk concurrently, preserving order."""
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+    async def summarize_chunk(chunk: str) -> str:
+        async with semaphore:
+            return await _ask(chunk_summary_agent, chunk)
+
+    return await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+
+
+def needs_map_reduce(transcription: str) -> bool:
+    return estimate_tokens(transcription) > SUMMARY_MAP_REDUCE_THRESHOLD
+
+
+async def summarize(transcription: str, segment_texts: list[str] | None = None) -> tuple[str, dict]:
+    """Return (summary, stats). Long transcripts are summarized hierarchically."""
+    cached = await get_cached_summary(transcription)
+    if cached is not None:
+        return cached, {"mode": "cached"}
+
+    started = time.perf_counter()
+    if not needs_map_reduce(transcription):
+        summary = await _ask(summary_agent, transcription)
+        await cache_summary(transcription, summary)
+        return summary, {"mode": "single", "total_seconds": round(time.perf_counter() - started, 2)}
+
+    chunks = split_transcript(transcription, segment_texts)
+    notes = await map_sections(chunks)
+    mapped = time.perf_counter()
+    summary = await _ask(summary_agent, build_reduce_input(notes))
+    finished = time.perf_counter()
+    await cache_summary(transcription, summary)
+
+    stats = {
+        "mode": "map_reduce",
+        "chunks": len(chunks),
+        "map_seconds": round(mapped - started, 2),
+        "reduce_seconds": round(finished - mapped, 2),
+        "total_seconds": round(finished - started, 2),
+    }
+    logger.info("Map-reduce summary: %s", stats)
+    return summary, stats
+
+
+async def _stream(agent, content: str):
+    async for token, _ in agent.astream(
+        {"messages": [{"role": "user", "content": content}]},
+        stream_mode="messages",
+    ):
+        if isinstance(token, AIMessageChunk) and token.text:
+            yield token.text
+
+
+async def stream_summary(transcription: str, segment_texts: list[str] | None = None, stats: dict | None = None):
+    """Yield summary text deltas as the model produces them.
+
+    For long transcripts the map phase runs first and only the reduce call is
+    streamed. Timing stats are written into `stats` once the stream ends.
+    """
+    stats = stats if stats is not None else {}
+    cached = await get_cached_summary(transcription)
+    if cached is not None:
+        stats["mode"] = "cached"
+        yield cached
+        return
+
+    started = time.perf_counter()
+    content = transcription
+    stats["mode"] = "single"
+    if needs_map_reduce(transcription):
+        chunks = split_transcript(transcription, segment_texts)
+        notes = await map_sections(chunks)
+        content = build_reduce_input(notes)
+        stats.update(mode="map_reduce", chunks=len(chunks), map_seconds=round(time.perf_counter() - started, 2))
+
+    first_token_at = None
+    deltas = []
+    async for delta in _stream(summary_agent, content):
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+            stats["first_token_seconds"] = round(first_token_at - started, 2)
+        deltas.append(delta)
+        yield delta
+    stats["total_seconds"] = round(time.perf_counter() - started, 2)
+    await cache_summary(transcription, "".join(deltas))
@@ -0,0 +1,37 @@
+import os
+import hashlib
+from dotenv import load_dotenv
+
+from .cache import LRUCache, DiskCache, TieredCache
+from agents.summarize_agent import SUMMARY_MODEL, SUMMARY_PROMPT_VERSION
+
+load_dotenv()
+
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", 7 * 24 * 60 * 60))
+SUMMARY_CACHE_MAX_BYTES = int(os.getenv("SUMMARY_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+SUMMARY_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR")  # optional durable tier
+SUMMARY_CACHE_DIR_MAX_BYTES = int(os.getenv("SUMMARY_CACHE_DIR_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def _build_cache() -> TieredCache:
+    memory = LRUCache(max_bytes=SUMMARY_CACHE_MAX_BYTES, ttl=SUMMARY_CACHE_TTL)
+    durable = None
+    if SUMMARY_CACHE_DIR:
+        durable = DiskCache(SUMMARY_CACHE_DIR, ttl=SUMMARY_CACHE_TTL, max_bytes=SUMMARY_CACHE_DIR_MAX_BYTES)
+    return TieredCache(memory, durable)
+
+
+summary_cache = _build_cache()
+
+
+def _key(transcription: str) -> tuple:
+    fingerprint = hashlib.sha256(transcription.encode()).hexdigest()
+    return (fingerprint, SUMMARY_MODEL, SUMMARY_PROMPT_VERSION)
+
+
+async def get_cached_summary(transcription: str) -> str | None:
+    return await summary_cache.aget(_key(transcription))
+
+
+async def cache_summary(transcription: str, summary: str):
+    await summary_cache.aset(_key(transcription), summary)
@@ -0,0 +1,77 @@
+import sys
+from array import array
+from typing import NamedTuple
+
+
+class Snippet(NamedTuple):
+    text: str
+    start: float
+    duration: float
+
+
+class SnippetTimeline:
+    """Compact, read-only snippet timeline.
+
+    Parallel `start`/`duration` float arrays plus a single text buffer with
+    offsets, instead of thousands of small snippet objects. Indexing yields
+    `Snippet` tuples, so it can be passed anywhere a snippet list is expected.
+    """
+
+    __slots__ = ("starts", "durations", "text", "offsets")
+
+    def __init__(self, starts: array, durations: array, text: str, offsets: array):
+        self.starts = starts
+        self.durations = durations
+        self.text = text
+        self.offsets = offsets  # len(starts) + 1 entries; snippet i is text[offsets[i]:offsets[i + 1]]
+
+    @classmethod
+    def from_snippets(cls, snippets) -> "SnippetTimeline":
+        starts = array("d")
+        durations = array("d")
+        offsets = array("L", [0])
+        texts = []
+        position = 0
+        for s in snippets:
+            starts.append(s.start)
+            durations.append(s.duration)
+            texts.append(s.text)
+            position += len(s.text)
+            offsets.append(position)
+        return cls(starts, durations, "".join(texts), offsets)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Snippet:
+        if i < 0:
+            i += len(self)
+        return Snippet(self.text[self.offsets[i]:self.offsets[i + 1]], self.starts[i], self.durations[i])
+
+    def __iter__(self):
+        text, offsets = self.text, self.offsets
+        for i in range(len(self.starts)):
+            yield Snippet(text[offsets[i]:offsets[i + 1]], self.starts[i], self.durations[i])
+
+    @property
+    def nbytes(self) -> int:
+        # getsizeof, not len: str stores 1, 2 or 4 bytes per character
+        # depending on the widest one, so CJK text takes twice its length.
+        return (
+            self.starts.itemsize * len(self.starts)
+            + self.durations.itemsize * len(self.durations)
+            + self.offsets.itemsize * len(self.offsets)
+            + sys.getsizeof(self.text)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "start": self.starts.tolist(),
+            "duration": self.durations.tolist(),
+            "text": self.text,
+            "offsets": self.offsets.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SnippetTimeline":
+        return cls(array("d", data["start"]), array("d", data["duration"]), data["text"], array("L", data["offsets"]))
@@ -0,0 +1,71 @@
+import os
+import orjson
+from dotenv import load_dotenv
+
+from .cache import LRUCache, DiskCache, TieredCache
+from .timeline import SnippetTimeline
+
+load_dotenv()
+
+# Caption tracks rarely change once published, so entries can live for hours.
+TRANSCRIPT_CACHE_TTL = float(os.getenv("TRANSCRIPT_CACHE_TTL", 6 * 60 * 60))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR")  # optional shared disk tier
+TRANSCRIPT_CACHE_DIR_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_DIR_MAX_BYTES", 1024 * 1024 * 1024))
+
+
+def _entry_to_json(entry: dict) -> dict:
+    data = {**entry, "timeline": entry["timeline"].to_dict()}
+    del data["segments_json"]
+    return data
+
+
+def _entry_from_json(data: dict) -> dict:
+    return {
+        **data,
+        "timeline": SnippetTimeline.from_dict(data["timeline"]),
+        "segments_json": orjson.dumps(data["segments"]),
+    }
+
+
+def _entry_size(entry: dict) -> int:
+    # The segment objects, estimated by their JSON length, plus that JSON itself.
+    return entry["timeline"].nbytes + 2 * len(entry["segments_json"])
+
+
+def _build_cache() -> TieredCache:
+    memory = LRUCache(max_bytes=TRANSCRIPT_CACHE_MAX_BYTES, ttl=TRANSCRIPT_CACHE_TTL)
+    durable = None
+    if TRANSCRIPT_CACHE_DIR:
+        durable = DiskCache(TRANSCRIPT_CACHE_DIR, ttl=TRANSCRIPT_CACHE_TTL, max_bytes=TRANSCRIPT_CACHE_DIR_MAX_BYTES,
+                            dumps=_entry_to_json, loads=_entry_from_json)
+    return TieredCache(memory, durable, sizeof=_entry_size)
+
+
+transcript_cache = _build_cache()
+
+
+async def get_cached_transcript(video_id: str, language: str) -> dict | None:
+    """Return {"timeline", "segments", "segments_json", "word_count"} for a previously fetched transcript.
+
+    `segments` is the default 30 s grouping; `timeline` keeps the raw snippets
+    so other groupings can be built without refetching.
+    """
+    return await transcript_cache.aget((video_id, language))
+
+
+async def cache_transcript(video_id: str, language: str, snippets, segments: list[dict], word_count: int) -> dict:
+    entry = {
+        "timeline": SnippetTimeline.from_snippets(snippets),
+        "segments": segments,
+        # Pre-serialized for responses, so a cache hit skips JSON encoding.
+        "segments_json": orjson.dumps(segments),
+        "word_count": word_count,
+    }
+    await transcript_cache.aset((video_id, language), entry)
+    return entry
+
+
+def get_encoded_segments(entry: dict) -> orjson.Fragment:
+    """JSON for the entry's default segments, encoded when it was cached, to splice into responses."""
+    return orjson.Fragment(entry["segments_json"])
@@ -0,0 +1,130 @@
+import os
+import re
+import asyncio
+import logging
+from dotenv import load_dotenv
+
+from agents.translate_agent import translate
+from .translation_cache import get_cached_translation, cache_translation
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TRANSLATE_BATCH_TOKENS = int(os.getenv("TRANSLATE_BATCH_TOKENS", 1000))
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", 8))
+TRANSLATE_RETRIES = int(os.getenv("TRANSLATE_RETRIES", 2))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) — good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def group_batches(texts: list[str], max_tokens: int = TRANSLATE_BATCH_TOKENS) -> list[list[str]]:
+    """Greedily group consecutive segment texts into batches under `max_tokens`.
+
+    A single segment larger than the budget becomes its own batch.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and current_tokens + tokens > max_tokens:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def pack_batches(texts: list[str], max_tokens: int = TRANSLATE_BATCH_TOKENS) -> list[str]:
+    """Like group_batches, with each batch joined into a single text."""
+    return [" ".join(batch) for batch in group_batches(texts, max_tokens)]
+
+
+_NUMBERED_LINE = re.compile(r"^\s*\[(\d+)\]\s?(.*)$")
+
+
+def number_segments(texts: list[str]) -> str:
+    """One "[n] text" line per segment, so the reply can be split back into segments."""
+    return "\n".join(f"[{i}] {' '.join(text.split())}" for i, text in enumerate(texts, start=1))
+
+
+def split_numbered(reply: str, count: int) -> list[str] | None:
+    """Inverse of number_segments; None unless each of the `count` segments came back once."""
+    parts = {}
+    current = None
+    for line in reply.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if match:
+            current = int(match.group(1))
+            if current in parts:
+                return None
+            parts[current] = [match.group(2).strip()]
+        elif current is not None and line.strip():
+            parts[current].append(line.strip())
+    if not parts and count == 1 and reply.strip():
+        return [reply.strip()]
+    if sorted(parts) != list(range(1, count + 1)):
+        return None
+    return [" ".join(parts[i]).strip() for i in range(1, count + 1)]
+
+
+async def _translate_batch(texts: list[str], language: str, semaphore: asyncio.Semaphore) -> list[str]:
+    """Translations for one batch, one per segment; cached per segment."""
+    translations = [await get_cached_translation(text, language) for text in texts]
+    missing = [i for i, translated in enumerate(translations) if translated is None]
+    if not missing:
+        return translations
+
+    pending = [texts[i] for i in missing]
+    for attempt in range(TRANSLATE_RETRIES + 1):
+        try:
+            async with semaphore:
+                reply = await translate(number_segments(pending), language)
+            translated = split_numbered(reply, len(pending))
+            if translated is None:
+                raise ValueError(f"Translation did not keep the {len(pending)} numbered segments")
+            break
+        except Exception:
+            if attempt == TRANSLATE_RETRIES:
+                raise
+            logger.warning("Translation batch failed, retrying (attempt %d)", attempt + 1)
+            await asyncio.sleep(2 ** attempt)
+
+    for i, text, result in zip(missing, pending, translated):
+        await cache_translation(text, language, result)
+        translations[i] = result
+    return translations
+
+
+async def translate_batches(texts: list[str], language: str):
+    """Translate segment texts in token-budgeted batches, concurrently.
+
+    Yields (source_text, translated_text | None) per segment, in order, as soon
+    as the head-of-line batch is done; None means its batch failed after retries.
+    """
+    semaphore = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+    batches = group_batches(texts)
+    tasks = [asyncio.create_task(_translate_batch(batch, language, semaphore)) for batch in batches]
+    try:
+        for batch, task in zip(batches, tasks):
+            try:
+                translations = await task
+            except Exception:
+                logger.exception("Translation batch failed after %d retries", TRANSLATE_RETRIES)
+                translations = [None] * len(batch)
+            for source, translated in zip(batch, translations):
+                yield source, translated
+    finally:
+        # Client went away (or we finished): stop any batches still queued.
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                task.exception()
+            else:
+                task.cancel()
@@ -0,0 +1,39 @@
+import os
+import re
+import hashlib
+from dotenv import load_dotenv
+
+from .cache import LRUCache, DiskCache, TieredCache
+from agents.translate_agent import TRANSLATE_PROMPT_VERSION
+
+load_dotenv()
+
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", 30 * 24 * 60 * 60))
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+TRANSLATION_CACHE_DIR = os.getenv("TRANSLATION_CACHE_DIR")  # optional durable tier
+TRANSLATION_CACHE_DIR_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_DIR_MAX_BYTES", 512 * 1024 * 1024))
+
+
+def _build_cache() -> TieredCache:
+    memory = LRUCache(max_bytes=TRANSLATION_CACHE_MAX_BYTES, ttl=TRANSLATION_CACHE_TTL)
+    durable = None
+    if TRANSLATION_CACHE_DIR:
+        durable = DiskCache(TRANSLATION_CACHE_DIR, ttl=TRANSLATION_CACHE_TTL, max_bytes=TRANSLATION_CACHE_DIR_MAX_BYTES)
+    return TieredCache(memory, durable)
+
+
+translation_cache = _build_cache()
+
+
+def _key(text: str, language: str) -> tuple:
+    normalized = re.sub(r"\s+", " ", text).strip()
+    digest = hashlib.sha256(normalized.encode()).hexdigest()
+    return (digest, language.strip().lower(), TRANSLATE_PROMPT_VERSION)
+
+
+async def get_cached_translation(text: str, language: str) -> str | None:
+    return await translation_cache.aget(_key(text, language))
+
+
+async def cache_translation(text: str, language: str, translated: str):
+    await translation_cache.aset(_key(text, language), translated)
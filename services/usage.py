@@ -0,0 +1,52 @@
+import os
+from dotenv import load_dotenv
+from sqlalchemy import update, case, func, or_
+
+from database.orm import User
+
+load_dotenv()
+
+FREE_MONTHLY_LIMIT = int(os.getenv("FREE_MONTHLY_LIMIT", 20))
+
+
+def _in_new_month():
+    """True when the user's counter was last reset in an earlier UTC calendar month."""
+    return func.timezone("UTC", User.usage_reset_at) < func.date_trunc("month", func.timezone("UTC", func.now()))
+
+
+async def consume_unit(db, user_id, limit: int = FREE_MONTHLY_LIMIT) -> int | None:
+    """Use one unit of the monthly quota. Returns the remaining quota, or None if exhausted.
+
+    The monthly reset and the increment happen in a single conditional UPDATE,
+    so concurrent requests are serialized by the row lock and can never push
+    the count past `limit`.
+    """
+    new_month = _in_new_month()
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, or_(new_month, User.usage_count < limit))
+        .values(
+            usage_count=case((new_month, 1), else_=User.usage_count + 1),
+            usage_reset_at=case((new_month, func.now()), else_=User.usage_reset_at),
+        )
+        .returning(User.usage_count)
+        # The commit below expires the session anyway; syncing it would make the
+        # ORM add the primary key to RETURNING (the WHERE can't be evaluated in Python).
+        .execution_options(synchronize_session=False)
+    )
+    usage_count = result.scalar_one_or_none()
+    await db.commit()
+    if usage_count is None:
+        return None
+    return limit - usage_count
+
+
+async def refund_unit(db, user_id):
+    """Give back a unit consumed by a request that then failed upstream."""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id, User.usage_count > 0)
+        .values(usage_count=User.usage_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
@@ -0,0 +1,59 @@
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from dotenv import load_dotenv
+
+from .cache import LRUCache
+
+load_dotenv()
+
+# Tier changes invalidate explicitly (Stripe webhooks); the TTL only bounds
+# staleness for changes made outside this process.
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
+USER_CACHE_MAX_BYTES = int(os.getenv("USER_CACHE_MAX_BYTES", 4 * 1024 * 1024))
+_SNAPSHOT_SIZE = 512
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Read-only snapshot of a User row, safe to share across requests and sessions.
+
+    Anything that writes to the user must load a fresh row with `db.get(User, user.id)`.
+    """
+    id: uuid.UUID
+    email: str
+    name: str
+    avatar_url: str | None
+    tier: str
+    usage_count: int
+    usage_reset_at: datetime
+
+    @classmethod
+    def from_orm(cls, user) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            avatar_url=user.avatar_url,
+            tier=user.tier,
+            usage_count=user.usage_count,
+            usage_reset_at=user.usage_reset_at,
+        )
+
+
+user_cache = LRUCache(max_bytes=USER_CACHE_MAX_BYTES, ttl=USER_CACHE_TTL)
+
+
+def get_cached_user(user_id) -> CachedUser | None:
+    return user_cache.get(str(user_id))
+
+
+def cache_user(user) -> CachedUser:
+    snapshot = CachedUser.from_orm(user)
+    user_cache.set(str(snapshot.id), snapshot, _SNAPSHOT_SIZE)
+    return snapshot
+
+
+def invalidate_user(user_id):
+    user_cache.invalidate(str(user_id))
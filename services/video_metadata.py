@@ -0,0 +1,84 @@
+import os
+import logging
+
+import httpx
+from dotenv import load_dotenv
+
+from .cache import LRUCache
+from .single_flight import single_flight
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OEMBED_URL = "https://www.youtube.com/oembed"
+VIDEO_METADATA_TTL = float(os.getenv("VIDEO_METADATA_TTL", 24 * 60 * 60))
+# Failed lookups (private/removed videos, upstream errors) are remembered
+# briefly so a retrying client does not hit oEmbed on every request.
+VIDEO_METADATA_NEGATIVE_TTL = float(os.getenv("VIDEO_METADATA_NEGATIVE_TTL", 5 * 60))
+VIDEO_METADATA_MAX_BYTES = int(os.getenv("VIDEO_METADATA_MAX_BYTES", 4 * 1024 * 1024))
+VIDEO_METADATA_TIMEOUT = float(os.getenv("VIDEO_METADATA_TIMEOUT", 5))
+
+metadata_cache = LRUCache(max_bytes=VIDEO_METADATA_MAX_BYTES, ttl=VIDEO_METADATA_TTL)
+_failed_lookups = LRUCache(max_bytes=VIDEO_METADATA_MAX_BYTES // 8, ttl=VIDEO_METADATA_NEGATIVE_TTL)
+
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=VIDEO_METADATA_TIMEOUT,
+            headers={"User-Agent": "TubeText/1.0"},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _fetch_metadata(video_id: str) -> dict | None:
+    try:
+        response = await _get_client().get(
+            OEMBED_URL,
+            params={"url": f"https://www.youtube.com/watch?v={video_id}", "format": "json"},
+        )
+        response.raise_for_status()
+        data = response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        logger.info("oEmbed lookup failed for %s: %s", video_id, e)
+        _failed_lookups.set(video_id, True, 64)
+        return None
+
+    metadata = {
+        "video_id": video_id,
+        "title": data.get("title"),
+        "channel": data.get("author_name"),
+        "channel_url": data.get("author_url"),
+        "thumbnail_url": data.get("thumbnail_url"),
+    }
+    metadata_cache.set(video_id, metadata)
+    return metadata
+
+
+async def get_video_metadata(video_id: str) -> dict | None:
+    """Title, channel and thumbnail from YouTube oEmbed, or None if the lookup fails.
+
+    oEmbed does not report duration; the audio pipeline gets it from yt-dlp.
+    """
+    metadata = metadata_cache.get(video_id)
+    if metadata is not None:
+        return metadata
+    if _failed_lookups.get(video_id):
+        return None
+    return await single_flight.do(("metadata", video_id), _fetch_metadata, video_id)
+
+
+def metadata_stats() -> dict:
+    return {"cache": metadata_cache.stats(), "failed_lookups": _failed_lookups.stats()}
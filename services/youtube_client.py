@@ -0,0 +1,189 @@
+import os
+import copy
+import time
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from youtube_transcript_api import YouTubeTranscriptApi, RequestBlocked, YouTubeRequestFailed
+from youtube_transcript_api.proxies import WebshareProxyConfig
+from dotenv import load_dotenv
+
+load_dotenv()
+
+YOUTUBE_POOL_MAXSIZE = int(os.getenv("YOUTUBE_POOL_MAXSIZE", 4))
+YOUTUBE_CLIENT_MAX_FAILURES = int(os.getenv("YOUTUBE_CLIENT_MAX_FAILURES", 3))
+YOUTUBE_CLIENT_MAX_AGE = float(os.getenv("YOUTUBE_CLIENT_MAX_AGE", 10 * 60))
+# Webshare rotates the exit IP per TCP connection, which is why the library sends
+# "Connection: close" by default. Keep-alive saves a TLS handshake per call but
+# pins a worker to one exit IP until the client is rebuilt.
+YOUTUBE_PROXY_KEEP_ALIVE = os.getenv("YOUTUBE_PROXY_KEEP_ALIVE", "false").lower() in ("1", "true", "yes")
+
+# Transport-level failures mean the session or exit IP is bad; "no transcript for
+# this video" style errors say nothing about client health.
+_UNHEALTHY_ERRORS = (requests.RequestException, RequestBlocked, YouTubeRequestFailed)
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.clients_built = 0
+        self.rebuilds = 0
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+_stats = _Stats()
+
+
+# urllib3 re-dials a dropped connection object in place, so count TCP/TLS
+# handshakes at connect() rather than at pool allocation.
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _stats.incr("connections")
+        return super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _stats.incr("connections")
+        return super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+_COUNTING_POOLS = {"http": _CountingHTTPConnectionPool, "https": _CountingHTTPSConnectionPool}
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests and newly opened connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _COUNTING_POOLS
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        manager.pool_classes_by_scheme = _COUNTING_POOLS
+        return manager
+
+    def send(self, request, **kwargs):
+        _stats.incr("requests")
+        return super().send(request, **kwargs)
+
+
+def _proxy_config() -> WebshareProxyConfig:
+    return WebshareProxyConfig(
+        proxy_username=os.getenv("WEBSHARE_PROXY_USERNAME"),
+        proxy_password=os.getenv("WEBSHARE_PROXY_PASSWORD"),
+    )
+
+
+class _PooledClient:
+    def __init__(self, proxy_config: WebshareProxyConfig):
+        session = requests.Session()
+        self.api = YouTubeTranscriptApi(proxy_config=proxy_config, http_client=session)
+
+        # The library mounts its own adapters; replace them with pooled, counting
+        # ones that keep the same retry-on-429 behaviour.
+        adapter = _PooledAdapter(
+            pool_connections=YOUTUBE_POOL_MAXSIZE,
+            pool_maxsize=YOUTUBE_POOL_MAXSIZE,
+            max_retries=Retry(total=proxy_config.retries_when_blocked, status_forcelist=[429]),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if YOUTUBE_PROXY_KEEP_ALIVE:
+            session.headers.pop("Connection", None)
+
+        self.session = session
+        self.created_at = time.monotonic()
+        self.failures = 0
+        _stats.incr("clients_built")
+
+    def is_healthy(self) -> bool:
+        return (
+            self.failures < YOUTUBE_CLIENT_MAX_FAILURES
+            and time.monotonic() - self.created_at < YOUTUBE_CLIENT_MAX_AGE
+        )
+
+
+# YouTubeTranscriptApi is not thread-safe, so every offload thread keeps its own
+# long-lived client per proxy endpoint instead of building one per request.
+_local = threading.local()
+
+
+def _get_client() -> _PooledClient:
+    proxy_config = _proxy_config()
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = {}
+
+    client = clients.get(proxy_config.url)
+    if client is not None and not client.is_healthy():
+        client.session.close()
+        client = None
+        _stats.incr("rebuilds")
+    if client is None:
+        client = clients[proxy_config.url] = _PooledClient(proxy_config)
+    return client
+
+
+def _call(fn):
+    client = _get_client()
+    try:
+        result = fn(client.api)
+    except _UNHEALTHY_ERRORS:
+        client.failures += 1
+        raise
+    client.failures = 0
+    return result
+
+
+def fetch_transcript(video_id: str, languages: list[str]):
+    """Blocking — run through services.offload."""
+    return _call(lambda api: api.fetch(video_id, languages=languages))
+
+
+def list_transcripts(video_id: str):
+    """Blocking — run through services.offload."""
+    return _call(lambda api: api.list(video_id))
+
+
+def fetch_listed_transcript(transcript_list, languages: list[str]):
+    """Fetch a transcript from an already-listed TranscriptList — one request
+    instead of the list + fetch pair `fetch_transcript` makes. Blocking.
+    """
+    def fetch(api):
+        # The list may have been built on another thread; fetch a copy through
+        # this thread's session rather than the one it was listed with.
+        transcript = copy.copy(transcript_list.find_transcript(languages))
+        transcript._http_client = _get_client().session
+        return transcript.fetch()
+
+    return _call(fetch)
+
+
+def client_stats() -> dict:
+    requests_sent = _stats.requests
+    return {
+        "keep_alive": YOUTUBE_PROXY_KEEP_ALIVE,
+        "requests": requests_sent,
+        "connections_opened": _stats.connections,
+        "connection_reuse_rate": round(1 - _stats.connections / requests_sent, 3) if requests_sent else None,
+        "clients_built": _stats.clients_built,
+        "rebuilds": _stats.rebuilds,
+    }
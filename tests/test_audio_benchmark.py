@@ -0,0 +1,83 @@
+"""Peak RSS and wall time of the streaming audio path against the old download-to-file one.
+
+Opt-in, as it downloads a real video: set AUDIO_BENCHMARK_URL and run with `-s` to see the numbers.
+No Deepgram calls are made: the download path stops once the file is read for upload,
+the streaming path drains the chunks it would upload.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARK_URL = os.getenv("AUDIO_BENCHMARK_URL")
+
+pytestmark = [
+    pytest.mark.skipif(not BENCHMARK_URL, reason="AUDIO_BENCHMARK_URL not set"),
+    pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed"),
+]
+
+# Each path runs in its own interpreter, so ru_maxrss is that path's peak alone.
+_MEASURE = """
+import json, os, resource, sys, tempfile, time
+
+# Same imports for both paths, so the baseline RSS is the same.
+import yt_dlp
+from services.audio_pipeline import resolve_audio, stream_audio
+
+mode, url = sys.argv[1], sys.argv[2]
+started = time.perf_counter()
+if mode == "download":
+    # The pre-streaming pipeline: yt-dlp to disk, MP3 re-encode, whole file read for upload.
+    with tempfile.TemporaryDirectory() as tmpdir:
+        opts = {
+            "format": "bestaudio/best",
+            "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "192"}],
+            "outtmpl": os.path.join(tmpdir, "audio.%(ext)s"),
+            "quiet": True,
+            "no_warnings": True,
+        }
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            ydl.extract_info(url, download=True)
+        with open(os.path.join(tmpdir, "audio.mp3"), "rb") as f:
+            size = len(f.read())
+    first_chunk = time.perf_counter() - started
+else:
+    size = 0
+    first_chunk = None
+    for chunk in stream_audio(resolve_audio(url)):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        size += len(chunk)
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "upload_starts_after": first_chunk,
+    "bytes": size,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def _measure(mode: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE, mode, BENCHMARK_URL],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_streaming_beats_download_to_file():
+    download = _measure("download")
+    streaming = _measure("stream")
+    for name, run in (("download", download), ("stream", streaming)):
+        print(f"\n{name:>8}: {run['seconds']:7.1f}s total, upload starts after {run['upload_starts_after']:6.1f}s, "
+              f"{run['bytes'] / 1e6:7.1f} MB upload, {run['peak_rss_mb']:6.1f} MB peak RSS")
+
+    assert streaming["bytes"] < download["bytes"]
+    assert streaming["peak_rss_mb"] < download["peak_rss_mb"]
+    # Streaming uploads while it downloads; the old path could only start once everything was on disk.
+    assert streaming["upload_starts_after"] < download["upload_starts_after"]
@@ -0,0 +1,129 @@
+import asyncio
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import audio_pipeline
+from services.offload import pools
+
+AUDIO = {"url": "https://example.com/audio", "http_headers": {}, "duration": 3600.0}
+
+
+def test_window_keeps_only_utterances_starting_in_its_core(monkeypatch):
+    monkeypatch.setattr(audio_pipeline, "AUDIO_WINDOW_SECONDS", 100.0)
+    monkeypatch.setattr(audio_pipeline, "AUDIO_WINDOW_OVERLAP", 10.0)
+    requested = []
+
+    def fake_stream(audio, start=None, duration=None, cancelled=None):
+        requested.append((start, duration))
+        return iter(())
+
+    # Times are relative to the window's audio, which starts at 90s.
+    utterances = [
+        SimpleNamespace(start=2.0, end=12.0, transcript="tail of previous window"),
+        SimpleNamespace(start=10.0, end=15.0, transcript="first"),
+        SimpleNamespace(start=105.0, end=115.0, transcript="straddles the end"),
+        SimpleNamespace(start=112.0, end=118.0, transcript="next window's"),
+    ]
+    monkeypatch.setattr(audio_pipeline, "stream_audio", fake_stream)
+    monkeypatch.setattr(audio_pipeline, "transcribe_stream", lambda chunks: utterances)
+
+    kept = audio_pipeline._transcribe_window(AUDIO, 1)
+
+    assert requested == [(90.0, 120.0)]
+    assert [(u.start, u.end, u.transcript) for u in kept] == [
+        (100.0, 105.0, "first"),
+        (195.0, 205.0, "straddles the end"),
+    ]
+
+
+def test_first_window_starts_at_zero(monkeypatch):
+    monkeypatch.setattr(audio_pipeline, "AUDIO_WINDOW_SECONDS", 100.0)
+    monkeypatch.setattr(audio_pipeline, "AUDIO_WINDOW_OVERLAP", 10.0)
+    requested = []
+
+    def fake_stream(audio, start=None, duration=None, cancelled=None):
+        requested.append((start, duration))
+        return iter(())
+
+    monkeypatch.setattr(audio_pipeline, "stream_audio", fake_stream)
+    monkeypatch.setattr(audio_pipeline, "transcribe_stream", lambda chunks: [])
+    audio_pipeline._transcribe_window(AUDIO, 0)
+    assert requested == [(0.0, 110.0)]
+
+
+def test_windows_run_on_the_deepgram_pool_in_order(monkeypatch):
+    monkeypatch.setattr(audio_pipeline, "AUDIO_WINDOW_SECONDS", 600.0)
+    threads = set()
+
+    def fake_window(audio, index, cancelled=None):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01 * (6 - index))  # finish out of order
+        return [audio_pipeline.Utterance(start=index * 600.0, end=index * 600.0 + 1, transcript=str(index))]
+
+    monkeypatch.setattr(audio_pipeline, "_transcribe_window", fake_window)
+    completed = pools["deepgram"].completed
+    utterances = asyncio.run(audio_pipeline._transcribe_windows(AUDIO))
+
+    assert [u.transcript for u in utterances] == [str(i) for i in range(6)]
+    assert all(name.startswith("offload-deepgram") for name in threads)
+    assert pools["deepgram"].completed - completed == 6
+
+
+def test_first_failed_window_cancels_the_rest(monkeypatch):
+    monkeypatch.setattr(audio_pipeline, "AUDIO_WINDOW_SECONDS", 360.0)  # 10 windows
+    monkeypatch.setattr(audio_pipeline, "AUDIO_WINDOW_CONCURRENCY", 3)
+    started = []
+    aborted = []
+
+    def fake_window(audio, index, cancelled=None):
+        started.append(index)
+        if index == 0:
+            time.sleep(0.05)
+            raise RuntimeError("Deepgram rejected the upload")
+        # Stands in for an upload in flight: it stops as soon as it is cancelled.
+        if cancelled.wait(timeout=5):
+            aborted.append(index)
+            raise RuntimeError("Audio stream cancelled")
+        return []
+
+    async def run():
+        with pytest.raises(RuntimeError, match="rejected"):
+            await audio_pipeline._transcribe_windows(AUDIO)
+        # Aborted windows give their pool slot back once their thread exits.
+        for _ in range(100):
+            if pools["deepgram"].pending == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(audio_pipeline, "_transcribe_window", fake_window)
+    asyncio.run(run())
+
+    assert sorted(started) == [0, 1, 2]
+    assert sorted(aborted) == [1, 2]
+    assert pools["deepgram"].pending == 0
+
+
+def test_chatty_stderr_does_not_block_the_stream(monkeypatch):
+    # Far more stderr than a pipe buffer holds, written before any stdout.
+    script = "import sys; sys.stderr.write('w' * (1 << 20)); sys.stderr.flush(); sys.stdout.write('audio')"
+    monkeypatch.setattr(audio_pipeline, "_ffmpeg_command", lambda *args: [sys.executable, "-c", script])
+
+    chunks = []
+    thread = threading.Thread(target=lambda: chunks.extend(audio_pipeline.stream_audio(AUDIO)), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert b"".join(chunks) == b"audio"
+
+
+def test_ffmpeg_failure_reports_stderr(monkeypatch):
+    script = "import sys; sys.stderr.write('Invalid data found'); sys.exit(1)"
+    monkeypatch.setattr(audio_pipeline, "_ffmpeg_command", lambda *args: [sys.executable, "-c", script])
+
+    with pytest.raises(RuntimeError, match="ffmpeg failed: Invalid data found"):
+        list(audio_pipeline.stream_audio(AUDIO))
@@ -0,0 +1,99 @@
+import json
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from dependencies.auth import require_premium
+
+batch = sys.modules["routes.batch_transcript"]
+
+GOOD = "https://youtu.be/aaaaaaaaaaa"
+OTHER = "https://youtu.be/bbbbbbbbbbb"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    async def fake_caption_transcript(video_id, language):
+        calls.append(video_id)
+        if video_id == "bbbbbbbbbbb":
+            raise RuntimeError("No transcript")
+        return {"segments": [{"timestamp": "(00:00)", "text": "hi"}], "word_count": 1}
+
+    monkeypatch.setattr(batch, "get_caption_transcript", fake_caption_transcript)
+    main.app.dependency_overrides[require_premium] = lambda: object()
+    yield TestClient(main.app), calls
+    main.app.dependency_overrides.pop(require_premium)
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_index_is_the_position_in_the_input(client):
+    client, calls = client
+    urls = ["not a url", GOOD, "also not a url", OTHER, GOOD]
+    lines = _lines(client.post("/video/batch", json={"video_urls": urls}))
+
+    trailer = lines.pop()
+    assert trailer == {"done": True, "total": 5, "failed": 3}
+    by_index = {line["index"]: line for line in lines}
+    assert sorted(by_index) == [0, 1, 2, 3, 4]
+    assert [by_index[i]["url"] for i in range(5)] == urls
+    assert [by_index[i]["success"] for i in range(5)] == [False, True, False, False, True]
+    assert by_index[3]["video_id"] == "bbbbbbbbbbb"
+    # The duplicate is fetched once and reported at both positions.
+    assert sorted(calls) == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+
+
+def test_too_many_items_is_rejected(client, monkeypatch):
+    client, _ = client
+    monkeypatch.setattr(batch, "BATCH_MAX_VIDEOS", 2)
+    response = client.post("/video/batch", json={"video_urls": [GOOD, OTHER, "x"]})
+    assert response.status_code == 400
+
+
+class _FakeYoutubeDL:
+    info = None
+
+    def __init__(self, opts):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        return self.info
+
+
+def test_playlist_keeps_only_video_entries(monkeypatch):
+    _FakeYoutubeDL.info = {"_type": "playlist", "entries": [
+        {"id": "aaaaaaaaaaa", "ie_key": "Youtube"},
+        {"id": "UCxxxxxxxxxxxxxxxxxxxxxx", "ie_key": "YoutubeTab"},
+        {"id": "bbbbbbbbbbb"},
+        {"id": None},
+    ]}
+    monkeypatch.setattr(batch.yt_dlp, "YoutubeDL", _FakeYoutubeDL)
+    assert batch._resolve_playlist("https://www.youtube.com/playlist?list=x") == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+
+
+def test_channel_tabs_are_not_videos(monkeypatch):
+    _FakeYoutubeDL.info = {"_type": "playlist", "entries": [
+        {"id": "UCxxxxxxxxxxxxxxxxxxxxxx", "ie_key": "YoutubeTab", "title": "Videos"},
+        {"id": "UCxxxxxxxxxxxxxxxxxxxxxx", "ie_key": "YoutubeTab", "title": "Shorts"},
+    ]}
+    monkeypatch.setattr(batch.yt_dlp, "YoutubeDL", _FakeYoutubeDL)
+    assert batch._resolve_playlist("https://www.youtube.com/@channel") == []
+
+
+def test_single_video_url_is_not_a_playlist(monkeypatch):
+    _FakeYoutubeDL.info = {"id": "aaaaaaaaaaa", "title": "A video"}
+    monkeypatch.setattr(batch.yt_dlp, "YoutubeDL", _FakeYoutubeDL)
+    with pytest.raises(ValueError):
+        batch._resolve_playlist(GOOD)
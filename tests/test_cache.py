@@ -0,0 +1,116 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from services import cache
+from services.cache import DiskCache, LRUCache, TieredCache
+
+
+def _age(disk: DiskCache, key, seconds: float):
+    path = disk._path(key)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def _wait_for_sweep(disk: DiskCache):
+    with disk._sweep_lock:
+        pass
+
+
+@pytest.fixture
+def no_background_sweep(monkeypatch):
+    monkeypatch.setattr(DiskCache, "_maybe_sweep", lambda self: None)
+
+
+def test_lru_evicts_oldest_over_budget():
+    lru = LRUCache(max_bytes=10, ttl=60)
+    lru.set("a", "x", 4)
+    lru.set("b", "y", 4)
+    lru.get("a")
+    lru.set("c", "z", 4)
+    assert lru.get("b") is None
+    assert lru.get("a") == "x" and lru.get("c") == "z"
+
+
+def test_disk_round_trip_and_tiered_promotion(tmp_path, no_background_sweep):
+    disk = DiskCache(str(tmp_path), ttl=60)
+    tiered = TieredCache(LRUCache(max_bytes=1024, ttl=60), disk)
+    tiered.set(("video", "en"), {"segments": [1, 2]})
+    fresh = TieredCache(LRUCache(max_bytes=1024, ttl=60), disk)
+    assert fresh.get(("video", "en")) == {"segments": [1, 2]}
+    assert fresh.memory.get(("video", "en")) == {"segments": [1, 2]}
+
+
+def test_sweep_removes_expired_files(tmp_path, no_background_sweep):
+    disk = DiskCache(str(tmp_path), ttl=60)
+    disk.set("old", "value")
+    disk.set("new", "value")
+    _age(disk, "old", 120)
+    leftover_tmp = os.path.join(os.path.dirname(disk._path("new")), "orphan.json.1.2.tmp")
+    open(leftover_tmp, "w").close()
+    os.utime(leftover_tmp, (time.time() - 2 * 60 * 60,) * 2)
+
+    assert disk.sweep() == 2
+    assert not os.path.exists(disk._path("old"))
+    assert not os.path.exists(leftover_tmp)
+    assert disk.get("new") == "value"
+
+
+def test_sweep_trims_oldest_entries_to_budget(tmp_path, no_background_sweep):
+    disk = DiskCache(str(tmp_path), ttl=3600)
+    for i in range(10):
+        disk.set(i, "x" * 100)
+        _age(disk, i, 100 - i)  # 0 is the oldest
+    entry_size = os.path.getsize(disk._path(0))
+
+    disk.max_bytes = entry_size * 4
+    assert disk.sweep() == 6
+    assert [i for i in range(10) if disk.get(i) is not None] == [6, 7, 8, 9]
+    assert disk.stats()["bytes"] == entry_size * 4
+
+
+def test_writes_trigger_a_periodic_background_sweep(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "DISK_CACHE_SWEEP_SECONDS", 3600)
+    disk = DiskCache(str(tmp_path), ttl=60)
+    disk.set("a", "value")  # the first write sweeps right away
+    _wait_for_sweep(disk)
+    _age(disk, "a", 120)
+
+    disk._next_sweep = 0
+    disk.set("b", "value")
+    _wait_for_sweep(disk)
+    assert disk.removed == 1
+    assert not os.path.exists(disk._path("a"))
+    # The next sweep waits for the interval.
+    assert disk._next_sweep > time.monotonic() + 3000
+
+
+def test_tiered_async_access_keeps_disk_io_off_the_event_loop(tmp_path):
+    threads = []
+
+    class RecordingDisk(DiskCache):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value):
+            threads.append(threading.get_ident())
+            super().set(key, value)
+
+    disk = RecordingDisk(str(tmp_path), ttl=60)
+    cache = TieredCache(LRUCache(max_bytes=1024, ttl=60), disk)
+
+    async def scenario():
+        await cache.aset("k", {"text": "v"})
+        cache.memory.invalidate("k")
+        value = await cache.aget("k")  # from disk, promoted to memory
+        assert await cache.aget("k") == value  # memory hit, disk untouched
+        return value, threading.get_ident()
+
+    value, loop_thread = asyncio.run(scenario())
+    assert value == {"text": "v"}
+    assert len(threads) == 2
+    assert loop_thread not in threads
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from sqlalchemy import func, select
+
+from database.connection import (
+    DB_MAX_OVERFLOW, DB_POOL_SIZE, DB_POOL_TIMEOUT, SessionLocal, _pool_stats, engine, pool_stats,
+)
+
+QUERY_SECONDS = 0.02
+
+
+async def _request(peak: list):
+    async with SessionLocal() as db:
+        await db.execute(select(func.pg_sleep(QUERY_SECONDS)))
+        peak[0] = max(peak[0], engine.pool.checkedout())
+
+
+def test_pool_wait_under_concurrent_requests(run_db):
+    """Benchmark: checkout wait as concurrency outgrows the pool (run with -s for the table)."""
+    async def scenario():
+        rows = []
+        for concurrency in (1, DB_POOL_SIZE, DB_POOL_SIZE + DB_MAX_OVERFLOW, 100):
+            before = pool_stats()
+            waited_before = _pool_stats.wait_seconds_total
+            peak = [0]
+            started = time.perf_counter()
+            await asyncio.gather(*(_request(peak) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+            after = pool_stats()
+
+            checkouts = after["checkouts"] - before["checkouts"]
+            waited = _pool_stats.wait_seconds_total - waited_before
+            rows.append((concurrency, elapsed, waited / checkouts, peak[0]))
+
+            assert checkouts == concurrency
+            assert after["failed_checkouts"] == before["failed_checkouts"]
+            assert peak[0] <= DB_POOL_SIZE + DB_MAX_OVERFLOW
+        return rows, pool_stats()
+
+    rows, stats = run_db(scenario)
+    print(f"\npool_size={DB_POOL_SIZE} max_overflow={DB_MAX_OVERFLOW}, {QUERY_SECONDS * 1000:.0f} ms queries")
+    for concurrency, elapsed, wait_avg, peak in rows:
+        print(f"{concurrency:>4} concurrent: {elapsed * 1000:7.1f} ms total, "
+              f"{wait_avg * 1000:6.1f} ms avg checkout wait, {peak} connections at peak")
+
+    # 100 requests over pool_size + max_overflow connections queue for a few
+    # query lengths each, far inside the pool timeout.
+    assert stats["wait_seconds_max"] < DB_POOL_TIMEOUT / 10
@@ -0,0 +1,115 @@
+import json
+import sys
+from urllib.parse import unquote
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+from routes.utils import content_disposition, format_timestamp
+from services.export import (
+    chunked,
+    cues_from_segments,
+    cues_from_timeline,
+    parse_timestamp,
+    render_export,
+    WRITERS,
+)
+from services.timeline import Snippet, SnippetTimeline
+
+SEGMENTS = [
+    {"timestamp": "(00:00)", "text": "first part"},
+    {"timestamp": "(00:30)", "text": " second part "},
+    {"timestamp": "(1:00:05)", "text": "one two three four five six seven eight nine ten"},
+]
+
+
+@pytest.mark.parametrize("seconds", [0, 5, 59, 60, 61, 599, 3599, 3600, 3661, 36000])
+def test_parse_timestamp_inverts_format_timestamp(seconds):
+    assert parse_timestamp(format_timestamp(seconds)) == float(seconds)
+
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp("(02:03)") == 123.0
+    assert parse_timestamp("(1:02:03)") == 3723.0
+
+
+def test_cues_end_where_next_begins():
+    cues = list(cues_from_segments(SEGMENTS))
+    assert [(c["start"], c["end"]) for c in cues[:2]] == [(0.0, 30.0), (30.0, 3605.0)]
+    # Last cue: estimated from word count (10 words / 2.5 words/s).
+    assert cues[2]["end"] == pytest.approx(3605.0 + 4.0)
+    assert list(cues_from_segments([])) == []
+
+
+def test_cues_never_end_before_they_start():
+    cues = list(cues_from_segments([{"timestamp": "(00:10)", "text": "a"}, {"timestamp": "(00:05)", "text": "b"}]))
+    assert cues[0]["end"] == 10.0
+    assert cues[1]["end"] == 5.0 + 2.0
+
+
+def test_cues_from_timeline_use_real_durations():
+    timeline = SnippetTimeline.from_snippets([Snippet("hi", 1.5, 2.25)])
+    assert list(cues_from_timeline(timeline)) == [{"start": 1.5, "end": 3.75, "text": "hi"}]
+
+
+def _render(fmt):
+    return "".join(render_export(fmt, cues_from_segments(SEGMENTS), "Title"))
+
+
+def test_srt():
+    assert _render("srt").startswith(
+        "1\n00:00:00,000 --> 00:00:30,000\nfirst part\n\n"
+        "2\n00:00:30,000 --> 01:00:05,000\nsecond part\n\n"
+        "3\n01:00:05,000 --> 01:00:09,000\n"
+    )
+
+
+def test_vtt():
+    assert _render("vtt").startswith("WEBVTT\n\n00:00:00.000 --> 00:00:30.000\nfirst part\n\n")
+
+
+def test_txt_and_markdown():
+    assert _render("txt").startswith("Title\n\n(00:00)\nfirst part\n\n(00:30)\nsecond part\n\n(1:00:05)\n")
+    assert _render("md").startswith("# Title\n\n**00:00** first part\n\n**00:30** second part\n\n**1:00:05** ")
+
+
+def test_ndjson():
+    lines = [json.loads(line) for line in _render("ndjson").splitlines()]
+    assert lines[1] == {"start": 30.0, "end": 3605.0, "timestamp": "(00:30)", "text": " second part "}
+    assert len(lines) == 3
+
+
+def test_every_format_is_registered():
+    assert set(WRITERS) == {"srt", "vtt", "txt", "md", "ndjson"}
+
+
+def test_chunked_joins_pieces_without_loss():
+    pieces = [f"{i}," for i in range(1000)]
+    chunks = list(chunked(iter(pieces), size=100))
+    assert "".join(chunks) == "".join(pieces)
+    assert all(len(c) >= 100 for c in chunks[:-1])
+    assert list(chunked(iter([]))) == []
+
+
+def test_export_download_named_after_a_non_latin_title(monkeypatch):
+    async def fake_metadata(video_id):
+        return {"title": "東京の夜 Ночной город"}
+
+    monkeypatch.setattr(sys.modules["routes.export_router"], "get_video_metadata", fake_metadata)
+    response = TestClient(main.app).post("/video/export", json={
+        "segments": SEGMENTS, "video_id": "ddddddddddd", "format": "srt",
+    })
+
+    assert response.status_code == 200
+    disposition = response.headers["content-disposition"]
+    assert disposition.startswith('attachment; filename="transcript.srt";')
+    assert unquote(disposition.split("filename*=UTF-8''")[1]) == "東京の夜_Ночной_город_Transcript.srt"
+
+
+def test_content_disposition_ascii_fallback():
+    assert content_disposition("Café déjà vu", "md") == (
+        "attachment; filename=\"Cafe_deja_vu_Transcript.md\"; filename*=UTF-8''Caf%C3%A9_d%C3%A9j%C3%A0_vu_Transcript.md"
+    )
+    assert content_disposition("東京", "srt").startswith('attachment; filename="transcript.srt";')
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from database.connection import SessionLocal
+from database.orm import TranscriptionJob
+from services import jobs
+from services.jobs import JobQueue, PREMIUM_JOB_STALE_SECONDS
+
+VIDEO_ID = "dQw4w9WgXcQ"
+VIDEO_URL = f"https://youtu.be/{VIDEO_ID}"
+
+
+def test_heartbeat_survives_database_errors(monkeypatch):
+    monkeypatch.setattr(jobs, "PREMIUM_JOB_HEARTBEAT_SECONDS", 0.01)
+    queue = JobQueue(handler=None)
+    beats = []
+
+    async def flaky_update(job_id, **values):
+        beats.append(job_id)
+        if len(beats) <= 2:
+            raise ConnectionError("database went away")
+
+    monkeypatch.setattr(queue, "_update", flaky_update)
+
+    async def scenario():
+        heartbeat = asyncio.create_task(queue._heartbeat("job"))
+        await asyncio.sleep(0.2)
+        assert not heartbeat.done()
+        heartbeat.cancel()
+
+    asyncio.run(scenario())
+    assert len(beats) > 3
+
+
+def test_start_rejects_a_heartbeat_slower_than_half_the_stale_window(monkeypatch):
+    monkeypatch.setattr(jobs, "PREMIUM_JOB_STALE_SECONDS", 30)
+    monkeypatch.setattr(jobs, "PREMIUM_JOB_HEARTBEAT_SECONDS", 60)
+    with pytest.raises(RuntimeError, match="PREMIUM_JOB_HEARTBEAT_SECONDS"):
+        asyncio.run(JobQueue(handler=None).start())
+
+
+def _start_workers(queue: JobQueue):
+    # Not queue.start(): that re-queues every unfinished job in the database.
+    queue._tasks = [asyncio.create_task(queue._worker()) for _ in range(queue.workers)]
+
+
+async def _status(job_id):
+    async with SessionLocal() as db:
+        job = await db.get(TranscriptionJob, job_id)
+        return job.status, job.stage
+
+
+async def _wait_for_status(job_id, status):
+    for _ in range(100):
+        if (await _status(job_id))[0] == status:
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"job never reached {status}")
+
+
+def test_stop_releases_jobs_interrupted_mid_run(run_db, make_user):
+    async def scenario():
+        async with SessionLocal() as db:
+            user_id = (await make_user(db, tier="premium")).id
+            started = asyncio.Event()
+
+            async def handler(job, set_stage):
+                await set_stage("transcribing")
+                started.set()
+                await asyncio.Event().wait()
+
+            queue = JobQueue(handler, workers=1)
+            _start_workers(queue)
+            job = await queue.submit(db, user_id, VIDEO_ID, VIDEO_URL, "en")
+            await asyncio.wait_for(started.wait(), 5)
+            assert await _status(job.id) == ("running", "transcribing")
+
+            await queue.stop()
+            assert await _status(job.id) == ("queued", "queued")
+
+    run_db(scenario)
+
+
+def test_stale_running_jobs_are_requeued_and_finished(run_db, make_user):
+    async def scenario():
+        async with SessionLocal() as db:
+            user_id = (await make_user(db, tier="premium")).id
+
+            async def handler(job, set_stage):
+                return {"segments": [], "word_count": 0}
+
+            queue = JobQueue(handler, workers=1)
+            job_id = (await queue.submit(db, user_id, VIDEO_ID, VIDEO_URL, "en")).id
+            # As left behind by a worker process that died mid-job.
+            await db.execute(
+                update(TranscriptionJob)
+                .where(TranscriptionJob.id == job_id)
+                .values(
+                    status="running",
+                    updated_at=datetime.now(timezone.utc) - timedelta(seconds=PREMIUM_JOB_STALE_SECONDS + 60),
+                )
+            )
+            await db.commit()
+
+            assert job_id in await queue._requeue_stale()
+            _start_workers(queue)
+            await _wait_for_status(job_id, "done")
+            await queue.stop()
+
+    run_db(scenario)
@@ -0,0 +1,28 @@
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+metrics = sys.modules["routes.metrics"]
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def test_metrics_are_off_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", None)
+    assert client.get("/metrics/").status_code == 404
+
+
+def test_metrics_require_the_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics/").status_code == 401
+    assert client.get("/metrics/", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics/", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "transcript_cache" in response.json()
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import main
+from services.offload import pools, run_blocking
+
+HEALTH_PROBES = 200
+HEALTH_P99_SECONDS = 0.05
+
+
+def test_run_blocking_rejects_past_capacity_without_blocking():
+    release = threading.Event()
+
+    async def scenario():
+        pool = pools["ytdlp"]
+        busy = [asyncio.create_task(run_blocking("ytdlp", release.wait, 10))
+                for _ in range(pool.max_workers + pool.max_queue)]
+        await asyncio.sleep(0.05)
+        rejected = pool.rejected
+        try:
+            with pytest.raises(HTTPException) as error:
+                await run_blocking("ytdlp", release.wait, 10)
+        finally:
+            release.set()
+            await asyncio.gather(*busy)
+        assert error.value.status_code == 503
+        assert error.value.headers["Retry-After"] == "5"
+        assert pool.rejected == rejected + 1
+
+    asyncio.run(scenario())
+
+
+def test_health_stays_fast_with_every_pool_saturated():
+    """Load test: /health/ p99 while every offload pool is full.
+
+    Each pool holds as many long blocking calls as it accepts, running and
+    queued, like premium downloads and Deepgram uploads in flight.
+    """
+    release = threading.Event()
+
+    async def scenario():
+        busy = [
+            asyncio.create_task(run_blocking(name, release.wait, 30))
+            for name, pool in pools.items()
+            for _ in range(pool.max_workers + pool.max_queue)
+        ]
+        await asyncio.sleep(0.05)
+        try:
+            assert all(pool.pending == pool.max_workers + pool.max_queue for pool in pools.values())
+            latencies = []
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                for _ in range(HEALTH_PROBES):
+                    started = time.perf_counter()
+                    response = await client.get("/health/")
+                    latencies.append(time.perf_counter() - started)
+                    assert response.status_code == 200
+        finally:
+            release.set()
+            await asyncio.gather(*busy)
+        return sorted(latencies)
+
+    latencies = asyncio.run(scenario())
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"\n/health/ under saturated pools: p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99 {p99 * 1000:.1f} ms")
+    assert p99 < HEALTH_P99_SECONDS
@@ -0,0 +1,138 @@
+import re
+import shutil
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from services import audio_pipeline
+from services.ranged_proxy import ranged_url
+
+CHUNK = 1000
+
+
+class _Upstream(BaseHTTPRequestHandler):
+    """Serves `server.data`, records every Range header, and honours Range like googlevideo."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        data = self.server.data
+        self.server.ranges.append(self.headers.get("Range"))
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if not match:
+            self.send_response(200)
+            body = data
+        else:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(data) - 1
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{start + len(body) - 1}/{len(data)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Upstream)
+    server.daemon_threads = True
+    server.data = bytes(range(256)) * 40
+    server.ranges = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_port}/audio"
+
+
+def _requested_sizes(ranges):
+    sizes = []
+    for header in ranges:
+        start, end = map(int, re.fullmatch(r"bytes=(\d+)-(\d+)", header).groups())
+        sizes.append(end - start + 1)
+    return sizes
+
+
+def test_reads_upstream_in_bounded_chunks(upstream):
+    with ranged_url(_url(upstream), {}, CHUNK) as url:
+        response = httpx.get(url)
+    assert response.status_code == 200
+    assert response.content == upstream.data
+    # One probe for the size, then one request per chunk, none larger than CHUNK.
+    assert upstream.ranges[0] == "bytes=0-0"
+    sizes = _requested_sizes(upstream.ranges[1:])
+    assert len(sizes) == len(upstream.data) // CHUNK + 1
+    assert max(sizes) <= CHUNK
+
+
+def test_serves_client_ranges_for_seeking(upstream):
+    with ranged_url(_url(upstream), {}, CHUNK, size=len(upstream.data)) as url:
+        response = httpx.get(url, headers={"Range": "bytes=2500-"})
+        head = httpx.head(url)
+        past_end = httpx.get(url, headers={"Range": f"bytes={len(upstream.data)}-"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 2500-{len(upstream.data) - 1}/{len(upstream.data)}"
+    assert response.content == upstream.data[2500:]
+    assert head.headers["content-length"] == str(len(upstream.data))
+    assert past_end.status_code == 416
+    # The size was known, so there was no probe and the read started at the requested byte.
+    assert upstream.ranges[0] == f"bytes=2500-{2500 + CHUNK - 1}"
+
+
+def test_url_is_gone_after_the_block(upstream):
+    with ranged_url(_url(upstream), {}, CHUNK) as url:
+        pass
+    assert httpx.get(url).status_code == 404
+
+
+def test_only_chunked_formats_go_through_the_proxy():
+    with audio_pipeline._ffmpeg_input({"url": "https://example.com/a", "http_headers": {"A": "b"}}) as (url, headers):
+        assert (url, headers) == ("https://example.com/a", {"A": "b"})
+    audio = {"url": "https://example.com/a", "http_headers": {"A": "b"}, "chunk_size": CHUNK}
+    with audio_pipeline._ffmpeg_input(audio) as (url, headers):
+        assert url.startswith("http://127.0.0.1:")
+        assert headers == {}
+
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+@requires_ffmpeg
+def test_stream_audio_transcodes_a_window_through_the_proxy(upstream, tmp_path):
+    # Written to a file, not a pipe, so the WAV header carries the real size and is seekable.
+    wav = tmp_path / "tone.wav"
+    subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=60",
+         "-ac", "1", "-ar", "16000", str(wav)],
+        check=True,
+    )
+    upstream.data = wav.read_bytes()
+    audio = {"url": _url(upstream), "http_headers": {}, "duration": 60.0,
+             "chunk_size": 64 * 1024, "filesize": len(upstream.data)}
+
+    ogg = b"".join(audio_pipeline.stream_audio(audio, start=30.0, duration=10.0))
+
+    assert ogg.startswith(b"OggS")
+    assert max(_requested_sizes(upstream.ranges)) <= 64 * 1024
+    # ffmpeg seeked to the 30 s mark (half of the file) instead of reading up to it.
+    starts = [int(re.match(r"bytes=(\d+)", header).group(1)) for header in upstream.ranges]
+    assert any(abs(start - len(upstream.data) // 2) < 1000 for start in starts)
+    assert sum(_requested_sizes(upstream.ranges)) < len(upstream.data)
+
+
+@requires_ffmpeg
+def test_stream_audio_reports_ffmpeg_errors(upstream):
+    upstream.data = b"not audio at all" * 100
+    audio = {"url": _url(upstream), "http_headers": {}, "duration": None, "chunk_size": CHUNK}
+    with pytest.raises(RuntimeError, match="ffmpeg failed: .+"):
+        list(audio_pipeline.stream_audio(audio))
@@ -0,0 +1,41 @@
+import json
+import sys
+
+from services.timeline import Snippet, SnippetTimeline
+
+SNIPPETS = [Snippet("héllo", 0.0, 1.5), Snippet("", 1.5, 0.5), Snippet("world ", 2.0, 3.25)]
+
+
+def test_round_trips_snippets():
+    timeline = SnippetTimeline.from_snippets(SNIPPETS)
+    assert len(timeline) == 3
+    assert list(timeline) == SNIPPETS
+    assert [timeline[i] for i in range(3)] == SNIPPETS
+    assert timeline[-1] == SNIPPETS[-1]
+
+
+def test_dict_round_trip_through_json():
+    timeline = SnippetTimeline.from_snippets(SNIPPETS)
+    restored = SnippetTimeline.from_dict(json.loads(json.dumps(timeline.to_dict())))
+    assert list(restored) == SNIPPETS
+
+
+def test_empty_timeline():
+    timeline = SnippetTimeline.from_snippets([])
+    assert len(timeline) == 0
+    assert list(timeline) == []
+    assert list(SnippetTimeline.from_dict(timeline.to_dict())) == []
+
+
+def test_nbytes_counts_arrays_and_text():
+    timeline = SnippetTimeline.from_snippets(SNIPPETS)
+    expected = 8 * 3 + 8 * 3 + timeline.offsets.itemsize * 4 + sys.getsizeof("hélloworld ")
+    assert timeline.nbytes == expected
+
+
+def test_nbytes_counts_wide_characters_at_their_storage_size():
+    latin = SnippetTimeline.from_snippets([Snippet("a" * 1000, 0.0, 1.0)])
+    cjk = SnippetTimeline.from_snippets([Snippet("東" * 1000, 0.0, 1.0)])
+    emoji = SnippetTimeline.from_snippets([Snippet("🎵" * 1000, 0.0, 1.0)])
+    assert cjk.nbytes - latin.nbytes >= 1000
+    assert emoji.nbytes - latin.nbytes >= 3000
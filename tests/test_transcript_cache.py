@@ -0,0 +1,44 @@
+import asyncio
+
+import orjson
+
+from services import transcript_cache as tc
+from services.cache import DiskCache, LRUCache, TieredCache
+from services.timeline import Snippet
+
+SNIPPETS = [Snippet("hello there", 0.0, 2.0), Snippet("general", 2.0, 1.5)]
+SEGMENTS = [{"timestamp": "(00:00)", "text": "hello there general"}]
+
+
+def test_encoded_segments_live_and_die_with_the_entry(monkeypatch):
+    monkeypatch.setattr(tc, "transcript_cache", TieredCache(LRUCache(max_bytes=1 << 20, ttl=60), sizeof=tc._entry_size))
+
+    async def scenario():
+        entry = await tc.cache_transcript("vid", "en", SNIPPETS, SEGMENTS, 3)
+        assert orjson.loads(orjson.dumps({"segments": tc.get_encoded_segments(entry)})) == {"segments": SEGMENTS}
+        # Replacing the transcript replaces its encoding with it.
+        fresh = [{"timestamp": "(00:00)", "text": "refreshed"}]
+        await tc.cache_transcript("vid", "en", SNIPPETS, fresh, 1)
+        entry = await tc.get_cached_transcript("vid", "en")
+        assert orjson.loads(entry["segments_json"]) == fresh
+        # Budgeted together: the encoded bytes count towards the entry's size.
+        assert tc._entry_size(entry) == entry["timeline"].nbytes + 2 * len(entry["segments_json"])
+        tc.transcript_cache.invalidate(("vid", "en"))
+        assert await tc.get_cached_transcript("vid", "en") is None
+
+    asyncio.run(scenario())
+
+
+def test_disk_tier_stores_segments_once_and_reencodes_on_load(tmp_path, monkeypatch):
+    disk = DiskCache(str(tmp_path), ttl=60, dumps=tc._entry_to_json, loads=tc._entry_from_json)
+    monkeypatch.setattr(tc, "transcript_cache", TieredCache(LRUCache(max_bytes=1 << 20, ttl=60), disk, tc._entry_size))
+
+    async def scenario():
+        await tc.cache_transcript("vid", "en", SNIPPETS, SEGMENTS, 3)
+        tc.transcript_cache.memory.invalidate(("vid", "en"))
+        return await tc.get_cached_transcript("vid", "en")
+
+    entry = asyncio.run(scenario())
+    assert "segments_json" not in open(disk._path(("vid", "en"))).read()
+    assert list(entry["timeline"]) == SNIPPETS
+    assert orjson.loads(entry["segments_json"]) == SEGMENTS
@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+
+import pytest
+
+from services import translation
+from services.translation import group_batches, number_segments, pack_batches, split_numbered
+
+
+def test_group_batches_respects_budget_and_order():
+    texts = [f"segment {i} " + "word " * 20 for i in range(40)]
+    batches = group_batches(texts, max_tokens=100)
+    assert len(batches) > 1
+    assert [text for batch in batches for text in batch] == texts
+    for batch in batches:
+        assert len(batch) == 1 or sum(translation.estimate_tokens(t) for t in batch) <= 100
+
+
+def test_oversized_segment_is_its_own_batch():
+    assert group_batches(["short", "x" * 4000, "short"], max_tokens=100) == [["short"], ["x" * 4000], ["short"]]
+
+
+def test_pack_batches_joins_groups():
+    assert pack_batches(["a", "b", "c"], max_tokens=1000) == ["a b c"]
+
+
+def test_numbered_round_trip():
+    texts = ["Hello there.", "Line with\nnewline", "Third"]
+    numbered = number_segments(texts)
+    assert numbered == "[1] Hello there.\n[2] Line with newline\n[3] Third"
+    assert split_numbered(numbered, 3) == ["Hello there.", "Line with newline", "Third"]
+
+
+def test_split_numbered_joins_wrapped_lines():
+    assert split_numbered("[1] Hola\nmundo\n\n[2] Adiós", 2) == ["Hola mundo", "Adiós"]
+
+
+@pytest.mark.parametrize("reply", ["[1] Hola", "[1] Hola\n[1] Otra vez\n[2] Adiós", "Hola\nAdiós", "[1] a\n[3] b"])
+def test_split_numbered_rejects_lost_segments(reply):
+    assert split_numbered(reply, 2) is None
+
+
+def test_split_numbered_accepts_single_unmarked_reply():
+    assert split_numbered("Hola mundo", 1) == ["Hola mundo"]
+
+
+def _collect(texts, language):
+    async def run():
+        return [item async for item in translation.translate_batches(texts, language)]
+    return asyncio.run(run())
+
+
+def test_translate_batches_yields_one_result_per_segment(monkeypatch):
+    calls = []
+
+    async def fake_translate(text, language):
+        calls.append(text)
+        return "\n".join(line.replace("segment", "segmento") for line in text.splitlines())
+
+    monkeypatch.setattr(translation, "translate", fake_translate)
+    monkeypatch.setattr(translation, "group_batches", lambda texts: group_batches(texts, max_tokens=50))
+    texts = [f"segment {i} " + "word " * 10 for i in range(40)]
+    results = _collect(texts, f"test-{uuid.uuid4()}")
+
+    assert len(calls) > 1
+    assert [source for source, _ in results] == texts
+    assert [translated for _, translated in results] == [
+        text.replace("segment", "segmento").strip() for text in texts
+    ]
+
+
+def test_failed_batch_marks_each_segment_untranslated(monkeypatch):
+    async def broken_translate(text, language):
+        return "no markers at all"
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(translation, "translate", broken_translate)
+    monkeypatch.setattr(translation.asyncio, "sleep", no_sleep)
+    results = _collect(["one", "two", "three"], f"test-{uuid.uuid4()}")
+    assert results == [("one", None), ("two", None), ("three", None)]
@@ -0,0 +1,113 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from jose import jwt
+from sqlalchemy import update
+
+import main
+from database.connection import SessionLocal
+from database.orm import User
+from dependencies.auth import JWT_SECRET, JWT_ALGORITHM
+from services.timeline import Snippet
+from services.usage import consume_unit, refund_unit
+
+PARALLEL = 100
+LIMIT = 20
+
+
+async def _user_row(user_id) -> User:
+    async with SessionLocal() as db:
+        return await db.get(User, user_id)
+
+
+async def _consume(user_id):
+    async with SessionLocal() as db:
+        return await consume_unit(db, user_id, LIMIT)
+
+
+def test_parallel_consumes_never_exceed_the_limit(run_db, make_user):
+    async def scenario():
+        async with SessionLocal() as db:
+            user_id = (await make_user(db)).id
+        results = await asyncio.gather(*(_consume(user_id) for _ in range(PARALLEL)))
+        granted = [r for r in results if r is not None]
+        assert len(granted) == LIMIT
+        assert sorted(granted) == list(range(LIMIT))
+        assert (await _user_row(user_id)).usage_count == LIMIT
+
+    run_db(scenario)
+
+
+def test_parallel_consumes_across_a_month_rollover(run_db, make_user):
+    async def scenario():
+        async with SessionLocal() as db:
+            user_id = (await make_user(db)).id
+            # Used up last month: the first consume this month resets the counter, exactly once.
+            await db.execute(
+                update(User).where(User.id == user_id)
+                .values(usage_count=LIMIT, usage_reset_at=datetime.now(timezone.utc) - timedelta(days=40))
+            )
+            await db.commit()
+        results = await asyncio.gather(*(_consume(user_id) for _ in range(PARALLEL)))
+        assert len([r for r in results if r is not None]) == LIMIT
+        user = await _user_row(user_id)
+        assert user.usage_count == LIMIT
+        assert user.usage_reset_at > datetime.now(timezone.utc) - timedelta(minutes=5)
+
+    run_db(scenario)
+
+
+def test_refund_gives_a_unit_back_and_never_goes_negative(run_db, make_user):
+    async def scenario():
+        async with SessionLocal() as db:
+            user_id = (await make_user(db)).id
+            assert await consume_unit(db, user_id, LIMIT) == LIMIT - 1
+            await refund_unit(db, user_id)
+            await refund_unit(db, user_id)
+            assert (await _user_row(user_id)).usage_count == 0
+
+    run_db(scenario)
+
+
+def test_parallel_video_requests_are_metered_exactly(run_db, make_user, monkeypatch):
+    vt = sys.modules["routes.video_transcript"]
+    calls = 0
+
+    async def fake_fetch(video_id, language):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if video_id.startswith("f"):
+            raise RuntimeError("No transcript")
+        return [Snippet("hello world", 0.0, 1.0)]
+
+    monkeypatch.setattr(vt, "_fetch_snippets", fake_fetch)
+
+    async def scenario():
+        async with SessionLocal() as db:
+            user_id = (await make_user(db)).id
+        token = jwt.encode({"sub": str(user_id)}, JWT_SECRET, algorithm=JWT_ALGORITHM)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test",
+                                     cookies={"tubetext_token": token}) as client:
+            # Distinct videos, so nothing is served from cache or shared in flight;
+            # every 10th one fails upstream and must be refunded.
+            video_ids = [f"{'f' if i % 10 == 0 else 'v'}{i:010d}" for i in range(PARALLEL)]
+            responses = await asyncio.gather(*(
+                client.post("/video/", params={"video_url": f"https://youtu.be/{video_id}"})
+                for video_id in video_ids
+            ))
+        limited = [r for r in responses if r.status_code == 429]
+        bodies = [r.json() for r in responses if r.status_code == 200]
+        succeeded = [b for b in bodies if b["success"]]
+        failed = [b for b in bodies if not b["success"]]
+
+        assert len(limited) + len(bodies) == PARALLEL
+        assert limited and failed
+        assert len(succeeded) <= LIMIT
+        assert (await _user_row(user_id)).usage_count == len(succeeded)
+        assert len(succeeded) + len(failed) >= LIMIT
+
+    run_db(scenario)
@@ -0,0 +1,119 @@
+import asyncio
+import random
+
+import pytest
+from fastapi import HTTPException
+
+from routes.utils import (
+    TranscriptRequest, format_timestamp, iter_merged_segments, make_transcript_id, merge_segments,
+    regroup_segments, resolve_transcript,
+)
+from services.export import parse_timestamp
+from services.timeline import Snippet, SnippetTimeline
+
+
+def _unpunctuated(count, step=2.0):
+    return SnippetTimeline.from_snippets(
+        Snippet(f"and then we talk about thing {i}", i * step, step) for i in range(count)
+    )
+
+
+def test_format_timestamp():
+    assert format_timestamp(65) == "(01:05)"
+    assert format_timestamp(3725) == "(1:02:05)"
+
+
+def _reference_merge(snippets, target_duration=30.0):
+    """merge_segments as it was before it became a generator."""
+    if not snippets:
+        return []
+    merged = []
+    current_start = snippets[0].start
+    current_texts = []
+    for snippet in snippets:
+        current_texts.append(getattr(snippet, 'text', None) or getattr(snippet, 'transcript', ''))
+        if snippet.start - current_start >= target_duration:
+            merged.append({"timestamp": format_timestamp(current_start), "text": " ".join(current_texts)})
+            current_start = snippet.start
+            current_texts = []
+    if current_texts:
+        merged.append({"timestamp": format_timestamp(current_start), "text": " ".join(current_texts)})
+    return merged
+
+
+def test_iter_merged_segments_matches_the_list_version():
+    rng = random.Random(1)
+    for count in (0, 1, 2, 50, 1000):
+        start = 0.0
+        snippets = []
+        for i in range(count):
+            start += rng.uniform(0.5, 8)
+            snippets.append(Snippet(f"word{i} " * rng.randint(0, 4), start, 1.0))
+        timeline = SnippetTimeline.from_snippets(snippets)
+        for duration in (5, 30, 60):
+            expected = _reference_merge(snippets, duration)
+            assert list(iter_merged_segments(timeline, duration)) == expected
+            assert merge_segments(snippets, duration) == expected
+
+
+def test_iter_merged_segments_is_lazy():
+    consumed = []
+
+    def snippets():
+        for i in range(1000):
+            consumed.append(i)
+            yield Snippet(f"word{i}", i * 5.0, 5.0)
+
+    first = next(iter_merged_segments(snippets(), 30))
+    assert first["timestamp"] == "(00:00)"
+    assert len(consumed) < 10
+
+
+def test_sentence_grouping_closes_at_sentence_end():
+    snippets = [
+        Snippet("first part", 0.0, 2.0),
+        Snippet("still going.", 31.0, 2.0),
+        Snippet("second sentence", 33.0, 2.0),
+        Snippet("ends here.", 70.0, 2.0),
+    ]
+    segments = regroup_segments(snippets, by="sentence", value=30)
+    assert segments == [
+        {"timestamp": "(00:00)", "text": "first part still going."},
+        {"timestamp": "(00:33)", "text": "second sentence ends here."},
+    ]
+
+
+def test_sentence_grouping_is_capped_without_punctuation():
+    # ~2 hours of auto-generated captions: no sentence ever ends.
+    timeline = _unpunctuated(3600)
+    segments = regroup_segments(timeline, by="sentence", value=30)
+
+    assert len(segments) > 100
+    assert sum(len(s["text"].split()) for s in segments) == 3600 * 7
+    starts = [parse_timestamp(s["timestamp"]) for s in segments]
+    assert all(end - start <= 2 * 30 + 2 for start, end in zip(starts, starts[1:]))
+
+
+def test_word_grouping():
+    segments = regroup_segments(_unpunctuated(10), by="words", value=14)
+    assert [len(s["text"].split()) for s in segments] == [14] * 5
+
+
+def test_resolve_transcript_falls_back_to_uploaded_segments():
+    request = TranscriptRequest(segments=[{"timestamp": "(00:00)", "text": "hi"}])
+    assert asyncio.run(resolve_transcript(request)) == (None, [{"timestamp": "(00:00)", "text": "hi"}])
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(resolve_transcript(TranscriptRequest()))
+    assert error.value.status_code == 400
+
+
+def test_resolve_transcript_reports_an_expired_handle():
+    request = TranscriptRequest(transcript_id=make_transcript_id("captions", "zzzzzzzzzzz", "en"))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(resolve_transcript(request))
+    assert error.value.status_code == 404
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(resolve_transcript(TranscriptRequest(transcript_id="forged")))
+    assert error.value.status_code == 400
@@ -0,0 +1,93 @@
+import asyncio
+import sys
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.timeline import Snippet
+from services.transcript_cache import get_cached_transcript, transcript_cache
+
+vt = sys.modules["routes.video_transcript"]
+
+VIDEO_ID = "ccccccccccc"
+VIDEO_URL = f"https://youtu.be/{VIDEO_ID}"
+SNIPPETS = [Snippet(f"line {i} of the talk", i * 4.0, 4.0) for i in range(100)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fetches = []
+
+    async def fake_fetch(video_id, language):
+        fetches.append(video_id)
+        return SNIPPETS
+
+    monkeypatch.setattr(vt, "_fetch_snippets", fake_fetch)
+    transcript_cache.invalidate((VIDEO_ID, "en"))
+    yield TestClient(main.app), fetches
+    transcript_cache.invalidate((VIDEO_ID, "en"))
+
+
+def _events(response):
+    return [orjson.loads(part[len("data: "):]) for part in response.text.split("\n\n") if part]
+
+
+def test_stream_sends_segments_then_trailer_and_caches(client):
+    client, fetches = client
+    response = client.post("/video/", params={"video_url": VIDEO_URL, "stream": "true"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "set-cookie" in response.headers
+    *segments, trailer = _events(response)
+
+    assert segments == vt.merge_segments(SNIPPETS)
+    assert trailer["done"] and trailer["success"]
+    assert trailer["word_count"] == 500
+    assert trailer["segment_count"] == len(segments)
+
+    entry = asyncio.run(get_cached_transcript(VIDEO_ID, "en"))
+    assert entry["segments"] == segments and entry["word_count"] == 500
+
+    # A cache hit streams the same events without fetching again.
+    again = client.post("/video/", params={"video_url": VIDEO_URL, "stream": "true"})
+    assert _events(again)[:-1] == segments
+    assert fetches == [VIDEO_ID]
+
+
+def test_stream_with_custom_duration_caches_default_segments(client):
+    client, _ = client
+    response = client.post("/video/", params={"video_url": VIDEO_URL, "stream": "true", "segment_duration": 60})
+    *segments, trailer = _events(response)
+
+    assert segments == vt.merge_segments(SNIPPETS, target_duration=60)
+    assert trailer["word_count"] == 500
+    assert asyncio.run(get_cached_transcript(VIDEO_ID, "en"))["segments"] == vt.merge_segments(SNIPPETS)
+
+
+def test_first_event_does_not_wait_for_the_whole_transcript():
+    consumed = []
+
+    class Counting:
+        def __iter__(self):
+            for snippet in SNIPPETS:
+                consumed.append(snippet)
+                yield snippet
+
+    async def first_event():
+        stream = vt._stream_segments(VIDEO_ID, "en", Counting(), True, 30.0, {})
+        event = await stream.__anext__()
+        await stream.aclose()
+        return event
+
+    assert asyncio.run(first_event()).startswith(b"data: ")
+    assert len(consumed) < len(SNIPPETS) // 4
+
+
+def test_json_response_shares_the_fetch_path(client):
+    client, fetches = client
+    body = client.post("/video/", params={"video_url": VIDEO_URL}).json()
+    assert body["success"] is True
+    assert body["segments"] == vt.merge_segments(SNIPPETS)
+    assert body["word_count"] == 500
+    assert fetches == [VIDEO_ID]
@@ -0,0 +1,43 @@
+import asyncio
+import sys
+
+import httpx
+import pytest
+
+import main
+from dependencies.auth import require_premium
+from services.audio_pipeline import Utterance
+
+premium = sys.modules["routes.video_transcript_premium"]
+
+VIDEO_URL = "https://youtu.be/eeeeeeeeeee"
+
+
+@pytest.fixture
+def transcriptions(monkeypatch):
+    calls = []
+
+    async def fake_transcribe(video_url, video_id, on_stage=None):
+        calls.append(video_id)
+        await asyncio.sleep(0.05)
+        return [Utterance(start=0.0, end=2.0, transcript="hello there")], 2
+
+    monkeypatch.setattr(premium, "_transcribe_video", fake_transcribe)
+    main.app.dependency_overrides[require_premium] = lambda: object()
+    yield calls
+    main.app.dependency_overrides.pop(require_premium)
+
+
+def test_languages_share_one_transcription(transcriptions):
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/video/premium/", params={"video_url": VIDEO_URL, "language": language})
+                for language in ("en", "de", "es", "en")
+            ))
+
+    responses = asyncio.run(scenario())
+    assert transcriptions == ["eeeeeeeeeee"]
+    assert [r.json()["language"] for r in responses] == ["en", "de", "es", "en"]
+    assert all(r.json()["segments"] == [{"timestamp": "(00:00)", "text": "hello there"}] for r in responses)